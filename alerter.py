@@ -2,60 +2,39 @@
 Telegram Alert System for Trading Bot
 Sends real-time notifications for critical events
 """
-import requests
+import asyncio
+import threading
+import aiohttp
 import os
+from collections import deque
+import time
 from loguru import logger
-from datetime import datetime
 
-class TelegramAlerter:
-    """Send alerts to Telegram for critical trading events."""
-
-    def __init__(self):
-        self.token = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
-        self.enabled = bool(self.token and self.chat_id)
-
-        if self.enabled:
-            logger.success("✅ Telegram alerts enabled")
-        else:
-            logger.warning("⚠️ Telegram alerts disabled (no credentials)")
+import http_client
 
-    def send(self, message: str, silent: bool = False):
-        """
-        Send alert to Telegram.
+# Pre-serialize payloads with orjson when available (C-speed JSON encode);
+# fall back to stdlib json otherwise
+try:
+    import orjson
 
-        Args:
-            message: Message to send (supports Markdown)
-            silent: If True, sends without notification sound
-        """
-        if not self.enabled:
-            logger.debug(f"Alert (not sent): {message}")
-            return
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
 
-        try:
-            url = f"https://api.telegram.org/bot{self.token}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "Markdown",
-                "disable_notification": silent
-            }
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
-            response = requests.post(url, json=payload, timeout=5)
+# Telegram hard limit on message length
+_MAX_MESSAGE_LEN = 4096
+# Separator between logical alerts batched into one message
+_BATCH_SEP = "\n\n---\n\n"
 
-            if response.status_code == 200:
-                logger.debug(f"✅ Telegram alert sent")
-            else:
-                logger.error(f"❌ Telegram alert failed: {response.text}")
+# Alert message templates, built once at import instead of re-parsing a
+# multi-line f-string literal on every call
+_BOT_STARTED_TEMPLATE = """🚀 **BOT STARTED** 🚀
 
-        except Exception as e:
-            logger.error(f"Failed to send Telegram alert: {e}")
-
-    def bot_started(self):
-        """Alert that bot has started."""
-        message = f"""🚀 **BOT STARTED** 🚀
-
-📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC
+📅 {ts} UTC
 
 ✅ Trading engine is now live
 🔍 Monitoring markets for opportunities
@@ -63,23 +42,16 @@ class TelegramAlerter:
 
 ⚡ All systems ready for trading!
 """
-        self.send(message)
 
-    def bot_stopped(self, reason: str = "Manual shutdown"):
-        """Alert that bot has stopped."""
-        message = f"""🛑 **BOT STOPPED** 🛑
+_BOT_STOPPED_TEMPLATE = """🛑 **BOT STOPPED** 🛑
 
-📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC
+📅 {ts} UTC
 📝 Reason: {reason}
 
 ⚠️ Trading has been paused
 """
-        self.send(message)
 
-    def buy_executed(self, symbol: str, price: float, quantity: float,
-                     usd_amount: float, ai_confidence: float, strategy: str):
-        """Alert for BUY order execution."""
-        message = f"""✅ **BUY ORDER EXECUTED** ✅
+_BUY_TEMPLATE = """✅ **BUY ORDER EXECUTED** ✅
 
 📊 Symbol: `{symbol}`
 💵 Price: ${price:.6f}
@@ -87,20 +59,12 @@ class TelegramAlerter:
 💰 Amount: ${usd_amount:.2f}
 
 🤖 AI Confidence: {ai_confidence:.1%}
-📈 Strategy: {strategy.replace('_', ' ').title()}
+📈 Strategy: {strategy}
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message)
 
-    def sell_executed(self, symbol: str, price: float, quantity: float,
-                      pnl_usd: float, pnl_percent: float, reason: str):
-        """Alert for SELL order execution."""
-
-        emoji = "🎉🟢" if pnl_usd > 0 else "🔴"
-        outcome = "PROFIT" if pnl_usd > 0 else "LOSS"
-
-        message = f"""{emoji} **SELL ORDER EXECUTED** {emoji}
+_SELL_TEMPLATE = """{emoji} **SELL ORDER EXECUTED** {emoji}
 
 📊 Symbol: `{symbol}`
 💵 Exit Price: ${price:.6f}
@@ -109,13 +73,10 @@ class TelegramAlerter:
 {outcome}: ${pnl_usd:+.2f} ({pnl_percent:+.2f}%)
 📝 Reason: {reason}
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message)
 
-    def stop_loss_hit(self, symbol: str, entry_price: float, exit_price: float, loss_percent: float):
-        """Alert for stop-loss trigger."""
-        message = f"""🛑 **STOP-LOSS TRIGGERED** 🛑
+_STOP_LOSS_TEMPLATE = """🛑 **STOP-LOSS TRIGGERED** 🛑
 
 📊 Symbol: `{symbol}`
 🔽 Entry: ${entry_price:.6f}
@@ -124,13 +85,10 @@ class TelegramAlerter:
 
 ⚠️ Position closed to protect capital
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message)
 
-    def take_profit_hit(self, symbol: str, entry_price: float, exit_price: float, profit_percent: float):
-        """Alert for take-profit trigger."""
-        message = f"""🎯 **TAKE-PROFIT TRIGGERED** 🎯
+_TAKE_PROFIT_TEMPLATE = """🎯 **TAKE-PROFIT TRIGGERED** 🎯
 
 📊 Symbol: `{symbol}`
 🔼 Entry: ${entry_price:.6f}
@@ -139,13 +97,10 @@ class TelegramAlerter:
 
 ✅ Target achieved successfully!
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message)
 
-    def critical_error(self, error_message: str):
-        """Alert for critical errors."""
-        message = f"""🚨 **CRITICAL ERROR** 🚨
+_CRITICAL_ERROR_TEMPLATE = """🚨 **CRITICAL ERROR** 🚨
 
 ⚠️ The bot encountered a critical issue:
 
@@ -154,16 +109,12 @@ class TelegramAlerter:
 🔧 Please check logs immediately
 ⏸️ Trading may have been paused
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message, silent=False)
 
-    def daily_summary(self, total_trades: int, wins: int, losses: int,
-                     total_pnl: float, win_rate: float):
-        """Send daily performance summary."""
-        message = f"""📊 **DAILY SUMMARY** 📊
+_DAILY_SUMMARY_TEMPLATE = """📊 **DAILY SUMMARY** 📊
 
-📅 {datetime.now().strftime('%Y-%m-%d')}
+📅 {date}
 
 🔢 Total Trades: {total_trades}
 ✅ Wins: {wins}
@@ -172,13 +123,10 @@ class TelegramAlerter:
 
 💰 Total P&L: ${total_pnl:+.2f}
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message)
 
-    def ai_validation_failed(self, symbol: str, reason: str):
-        """Alert when AI blocks a trade."""
-        message = f"""🛡️ **AI BLOCKED TRADE** 🛡️
+_AI_BLOCKED_TEMPLATE = """🛡️ **AI BLOCKED TRADE** 🛡️
 
 📊 Symbol: `{symbol}`
 🤖 AI Decision: HOLD
@@ -187,9 +135,419 @@ class TelegramAlerter:
 
 ✅ Capital protected by AI validation
 
-⏰ {datetime.now().strftime('%H:%M:%S')} UTC
+⏰ {ts} UTC
 """
-        self.send(message, silent=True)
+
+# Per-second memo of formatted timestamps: fmt -> (unix_second, string).
+# strftime is surprisingly heavy; alerts fired in the same second reuse it.
+_ts_cache = {}
+
+
+def _now_str(fmt: str = '%Y-%m-%d %H:%M:%S') -> str:
+    """Current UTC time formatted as `fmt`, cached per second."""
+    now = int(time.time())
+    cached = _ts_cache.get(fmt)
+    if cached and cached[0] == now:
+        return cached[1]
+    formatted = time.strftime(fmt, time.gmtime(now))
+    _ts_cache[fmt] = (now, formatted)
+    return formatted
+
+class AlertDedupQueue:
+    """
+    Coalesce identical rapid alerts into a single send.
+
+    Keyed by (event, symbol): if the same event fires again before the worker
+    gets to it, only the latest payload is sent. Collapses cascading
+    stop-loss / error loops from N API calls down to 1.
+    """
+
+    def __init__(self, send, min_interval: float = 2.0):
+        self._send = send  # coroutine function (message, silent)
+        self._min_interval = min_interval
+        self._pending = {}  # key -> (message, silent), latest payload wins
+        self._worker = None
+
+    async def put(self, key, message: str, silent: bool = False, immediate: bool = False):
+        self._pending[key] = (message, silent, immediate)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        while self._pending:
+            key = next(iter(self._pending))
+            message, silent, immediate = self._pending.pop(key)
+            await self._send(message, silent, immediate)
+            await asyncio.sleep(self._min_interval)
+
+
+class TelegramAlerter:
+    """Send alerts to Telegram for critical trading events."""
+
+    __slots__ = (
+        'token', 'chat_id', 'enabled', '_session', '_chat_bucket',
+        '_rate_lock', '_next_send_ts', '_global_window', '_dedup',
+        'batch_ms', '_pending_batch', '_batch_silent', '_queue', '_worker',
+        '_pause_until', '_loop', '_loop_thread',
+    )
+
+    def __init__(self, session: aiohttp.ClientSession = None):
+        self.token = os.getenv("TELEGRAM_BOT_TOKEN")
+        self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        self.enabled = bool(self.token and self.chat_id)
+
+        # Injected session, or None to use the process-wide shared pool
+        self._session = session
+        # Token-bucket pacing: Telegram allows ~1 msg/s per chat, 30 msg/s global
+        self._chat_bucket = asyncio.Semaphore(1)
+        self._rate_lock = asyncio.Lock()
+        self._next_send_ts = 0.0
+        self._global_window = deque(maxlen=30)
+        # Dedup queue collapsing repeated events (stop-loss loops, error storms)
+        self._dedup = AlertDedupQueue(self.send)
+        # Batching: alerts arriving within batch_ms are joined into one message
+        self.batch_ms = int(os.getenv("TELEGRAM_BATCH_MS", "250"))
+        self._pending_batch = []
+        self._batch_silent = True
+        # Single long-lived worker draining an asyncio.Queue: amortizes task
+        # scheduling under burst and sheds oldest alerts on overflow.
+        # Created lazily on the first send's event loop.
+        self._queue = None
+        self._worker = None
+        # When Telegram answers 429, all sends pause until this loop time
+        self._pause_until = 0.0
+        # Background event loop for fire-and-forget sends from sync callers
+        # (the trading loop runs in a plain thread without an event loop)
+        self._loop = None
+        self._loop_thread = None
+
+        if self.enabled:
+            logger.success("✅ Telegram alerts enabled")
+        else:
+            logger.warning("⚠️ Telegram alerts disabled (no credentials)")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the injected session or the process-wide shared pool."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return http_client.get_session()
+
+    def _ensure_background_loop(self):
+        """Start a dedicated event loop thread for callers without a running loop."""
+        if self._loop is None or not self._loop.is_running():
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever,
+                daemon=True,
+                name="TelegramAlerter"
+            )
+            self._loop_thread.start()
+        return self._loop
+
+    async def _throttle(self):
+        """
+        Pace sends to respect Telegram limits (1 msg/s per chat, 30 msg/s global).
+
+        Pre-emptive pacing avoids 429s and the backoff storms they cause
+        during burst events (e.g. many stop-losses at once).
+        """
+        loop = asyncio.get_running_loop()
+        async with self._rate_lock:
+            now = loop.time()
+            wait = self._next_send_ts - now
+            # Global 30 msg/s window: wait for the oldest of the last 30 sends
+            # to be more than a second old
+            if len(self._global_window) == self._global_window.maxlen:
+                wait = max(wait, self._global_window[0] + 1.0 - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = loop.time()
+            self._next_send_ts = now + 1.0
+            self._global_window.append(now)
+
+    async def send(self, message: str, silent: bool = False, immediate: bool = False):
+        """
+        Send alert to Telegram (non-blocking, batched).
+
+        Alerts arriving within `batch_ms` of each other are concatenated into
+        a single sendMessage call to amortize HTTP overhead and the per-chat
+        rate limit.
+
+        Args:
+            message: Message to send (supports Markdown)
+            silent: If True, sends without notification sound
+            immediate: If True, flush the batch right away (critical alerts)
+        """
+        if not self.enabled:
+            logger.opt(lazy=True).debug("Alert (not sent): {}", lambda: message)
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=256)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._worker_loop())
+
+        try:
+            self._queue.put_nowait((message, silent, immediate))
+        except asyncio.QueueFull:
+            # Shed the oldest alert under backpressure - the latest state is
+            # what matters during a burst
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait((message, silent, immediate))
+
+    async def _worker_loop(self):
+        """Long-lived consumer: collect alerts within the batch window, then flush."""
+        while True:
+            message, silent, immediate = await self._queue.get()
+            self._pending_batch.append(message)
+            self._batch_silent = self._batch_silent and silent
+
+            if not immediate:
+                # Keep collecting until the batch window goes quiet
+                try:
+                    while True:
+                        message, silent, immediate = await asyncio.wait_for(
+                            self._queue.get(), timeout=self.batch_ms / 1000
+                        )
+                        self._pending_batch.append(message)
+                        self._batch_silent = self._batch_silent and silent
+                        if immediate:
+                            break
+                except asyncio.TimeoutError:
+                    pass
+
+            await self._flush()
+
+    async def _flush(self):
+        """Join pending alerts (up to Telegram's 4096-char cap) and POST once."""
+        while self._pending_batch:
+            batch = []
+            size = 0
+            while self._pending_batch:
+                extra = len(self._pending_batch[0]) + (len(_BATCH_SEP) if batch else 0)
+                if batch and size + extra > _MAX_MESSAGE_LEN:
+                    break
+                batch.append(self._pending_batch.pop(0))
+                size += extra
+            silent = self._batch_silent
+            self._batch_silent = True
+            await self._post(_BATCH_SEP.join(batch)[:_MAX_MESSAGE_LEN], silent)
+
+    async def _post(self, message: str, silent: bool = False, max_retries: int = 3):
+        """Perform the throttled HTTP POST to Telegram, honoring Retry-After on 429."""
+        url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "Markdown",
+            "disable_notification": silent
+        }
+
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(max_retries):
+            try:
+                async with self._chat_bucket:
+                    await self._throttle()
+
+                # Respect any global pause from a previous 429
+                pause = self._pause_until - loop.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                session = self._get_session()
+                async with session.post(
+                    url,
+                    data=_json_dumps(payload),
+                    headers={"Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=5)
+                ) as response:
+                    if response.status == 200:
+                        logger.debug(f"✅ Telegram alert sent")
+                        return
+
+                    if response.status == 429:
+                        # Telegram tells us how long to back off; pause ALL
+                        # sends for that duration so concurrent alerts don't
+                        # extend the ban
+                        try:
+                            data = await response.json()
+                            retry_after = float(data['parameters']['retry_after'])
+                        except Exception:
+                            retry_after = 2.0 ** attempt
+                        self._pause_until = loop.time() + retry_after
+                        logger.warning(
+                            f"⚠️ Telegram rate limited, retrying in {retry_after:.0f}s "
+                            f"(attempt {attempt + 1}/{max_retries})"
+                        )
+                        await asyncio.sleep(retry_after)
+                        continue
+
+                    body = await response.text()
+                    logger.error(f"❌ Telegram alert failed: {body}")
+                    return
+
+            except Exception as e:
+                logger.error(f"Failed to send Telegram alert: {e}")
+                return
+
+        logger.error(f"❌ Telegram alert dropped after {max_retries} rate-limit retries")
+
+    def send_nowait(self, message: str, silent: bool = False):
+        """
+        Fire-and-forget send for callers that can't await.
+
+        Schedules on the running loop if there is one, otherwise dispatches
+        to a background loop thread so the caller never blocks.
+        """
+        if not self.enabled:
+            logger.opt(lazy=True).debug("Alert (not sent): {}", lambda: message)
+            return
+
+        self._submit(self.send(message, silent))
+
+    def send_deduped(self, key, message: str, silent: bool = False, immediate: bool = False):
+        """
+        Fire-and-forget send that coalesces duplicates.
+
+        Alerts sharing the same key within the dedup window are collapsed
+        so only the latest payload reaches Telegram.
+        """
+        if not self.enabled:
+            logger.opt(lazy=True).debug("Alert (not sent): {}", lambda: message)
+            return
+
+        self._submit(self._dedup.put(key, message, silent, immediate))
+
+    def _submit(self, coro):
+        """Schedule a coroutine on the running loop or the background loop."""
+        try:
+            asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            # No running loop (e.g. called from the trading thread)
+            loop = self._ensure_background_loop()
+            asyncio.run_coroutine_threadsafe(coro, loop)
+
+    async def close(self):
+        """Flush pending alerts and close the HTTP session (call on bot shutdown)."""
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+        if self._queue is not None:
+            while not self._queue.empty():
+                message, silent, _ = self._queue.get_nowait()
+                self._pending_batch.append(message)
+                self._batch_silent = self._batch_silent and silent
+        await self._flush()
+        if self._session is not None:
+            if not self._session.closed:
+                await self._session.close()
+        else:
+            await http_client.close_session()
+
+    def shutdown(self):
+        """Sync shutdown hook: close session and stop the background loop."""
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def bot_started(self):
+        """Alert that bot has started."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_BOT_STARTED_TEMPLATE.format(ts=_now_str()))
+
+    def bot_stopped(self, reason: str = "Manual shutdown"):
+        """Alert that bot has stopped."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_BOT_STOPPED_TEMPLATE.format(ts=_now_str(), reason=reason))
+
+    def buy_executed(self, symbol: str, price: float, quantity: float,
+                     usd_amount: float, ai_confidence: float, strategy: str):
+        """Alert for BUY order execution."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_BUY_TEMPLATE.format(
+            symbol=symbol, price=price, quantity=quantity,
+            usd_amount=usd_amount, ai_confidence=ai_confidence,
+            strategy=strategy.replace('_', ' ').title(),
+            ts=_now_str('%H:%M:%S')
+        ))
+
+    def sell_executed(self, symbol: str, price: float, quantity: float,
+                      pnl_usd: float, pnl_percent: float, reason: str):
+        """Alert for SELL order execution."""
+        if not self.enabled:
+            return
+
+
+        emoji = "🎉🟢" if pnl_usd > 0 else "🔴"
+        outcome = "PROFIT" if pnl_usd > 0 else "LOSS"
+
+        self.send_nowait(_SELL_TEMPLATE.format(
+            emoji=emoji, outcome=outcome, symbol=symbol, price=price,
+            quantity=quantity, pnl_usd=pnl_usd, pnl_percent=pnl_percent,
+            reason=reason, ts=_now_str('%H:%M:%S')
+        ))
+
+    def stop_loss_hit(self, symbol: str, entry_price: float, exit_price: float, loss_percent: float):
+        """Alert for stop-loss trigger."""
+        if not self.enabled:
+            return
+
+        message = _STOP_LOSS_TEMPLATE.format(
+            symbol=symbol, entry_price=entry_price, exit_price=exit_price,
+            loss_percent=loss_percent, ts=_now_str('%H:%M:%S')
+        )
+        self.send_deduped(("stop_loss", symbol), message)
+
+    def take_profit_hit(self, symbol: str, entry_price: float, exit_price: float, profit_percent: float):
+        """Alert for take-profit trigger."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_TAKE_PROFIT_TEMPLATE.format(
+            symbol=symbol, entry_price=entry_price, exit_price=exit_price,
+            profit_percent=profit_percent, ts=_now_str('%H:%M:%S')
+        ))
+
+    def critical_error(self, error_message: str):
+        """Alert for critical errors."""
+        if not self.enabled:
+            return
+
+        message = _CRITICAL_ERROR_TEMPLATE.format(
+            error_message=error_message, ts=_now_str('%H:%M:%S')
+        )
+        self.send_deduped(("critical_error", error_message), message, silent=False,
+                          immediate=True)
+
+    def daily_summary(self, total_trades: int, wins: int, losses: int,
+                     total_pnl: float, win_rate: float):
+        """Send daily performance summary."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_DAILY_SUMMARY_TEMPLATE.format(
+            date=_now_str('%Y-%m-%d'), total_trades=total_trades, wins=wins,
+            losses=losses, win_rate=win_rate, total_pnl=total_pnl,
+            ts=_now_str('%H:%M:%S')
+        ))
+
+    def ai_validation_failed(self, symbol: str, reason: str):
+        """Alert when AI blocks a trade."""
+        if not self.enabled:
+            return
+
+        self.send_nowait(_AI_BLOCKED_TEMPLATE.format(
+            symbol=symbol, reason=reason, ts=_now_str('%H:%M:%S')
+        ), silent=True)
 
 
 # Global instance
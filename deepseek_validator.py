@@ -2,21 +2,28 @@
 DeepSeek Validator - LLM-Based Signal Validation
 Uses DeepSeek AI to validate trading signals with natural language reasoning
 """
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from loguru import logger
 import os
 from datetime import datetime
 
+import http_client
+
 class DeepSeekValidator:
     """
     DeepSeek AI validator for trading signals
     Provides intelligent validation with natural language explanations
     """
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session: aiohttp.ClientSession = None):
         self.api_key = api_key or os.getenv('DEEPSEEK_API_KEY')
         self.base_url = "https://api.deepseek.com/v1"
+        # Injected async session, or None to use the process-wide shared pool
+        self._http_session = session
 
         # Disable ALL proxy settings (Windows/Linux compatible)
         os.environ['NO_PROXY'] = '*'
@@ -31,6 +38,11 @@ class DeepSeekValidator:
         self.session.trust_env = False  # Ignore system proxy settings
         self.session.proxies = {}  # Empty proxy dict
 
+        # Keep-alive connection pool: skip the TCP+TLS handshake (2 RTTs)
+        # on every API call after the first
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+        self.session.mount("https://", adapter)
+
         # 🧠 UPGRADED: Using DeepSeek-R1 Reasoning Model for superior trading analysis
         self.model = "deepseek-reasoner"  # Advanced reasoning with Chain-of-Thought
         self.temperature = 0.3  # Lower = more consistent
@@ -389,32 +401,38 @@ Remember: Missing a profitable trade is more costly than a stopped-out small pos
             }
 
             logger.debug(f"🧠 Calling DeepSeek-R1 reasoning model (attempt {retry_count + 1}/{max_retries + 1})...")
-            response = self.session.post(
+
+            # Use the injected session or the shared process-wide pool so
+            # DeepSeek and Telegram traffic reuse one connector
+            if self._http_session is not None and not self._http_session.closed:
+                session = self._http_session
+            else:
+                session = http_client.get_session()
+
+            async with session.post(
                 f"{self.base_url}/chat/completions",
                 headers=headers,
                 json=payload,
-                timeout=60  # Increased timeout for reasoning (thinking takes time)
-            )
-
-            response.raise_for_status()
+                timeout=aiohttp.ClientTimeout(total=60)  # Reasoning takes time
+            ) as response:
+                response.raise_for_status()
+                body = await response.text()
 
             # Handle empty response body (known DeepSeek API issue)
-            if not response.text or response.text.strip() == '':
+            if not body or body.strip() == '':
                 logger.warning(f"⚠️ DeepSeek returned empty response (attempt {retry_count + 1})")
                 if retry_count < max_retries:
-                    import asyncio
                     await asyncio.sleep(1)  # Brief delay before retry
                     return await self._call_deepseek_api(prompt, retry_count + 1)
                 else:
                     raise ValueError("DeepSeek API returned empty response after multiple retries")
 
-            data = response.json()
+            data = json.loads(body)
 
             # Validate response structure
             if 'choices' not in data or len(data['choices']) == 0:
                 logger.warning(f"⚠️ DeepSeek returned invalid structure (attempt {retry_count + 1})")
                 if retry_count < max_retries:
-                    import asyncio
                     await asyncio.sleep(1)
                     return await self._call_deepseek_api(prompt, retry_count + 1)
                 else:
@@ -432,7 +450,6 @@ Remember: Missing a profitable trade is more costly than a stopped-out small pos
             if not final_answer and not reasoning_content:
                 logger.warning(f"⚠️ Both reasoning_content and content are empty (attempt {retry_count + 1})")
                 if retry_count < max_retries:
-                    import asyncio
                     await asyncio.sleep(1)
                     return await self._call_deepseek_api(prompt, retry_count + 1)
                 else:
@@ -463,7 +480,7 @@ Remember: Missing a profitable trade is more costly than a stopped-out small pos
                 'answer': final_answer
             }
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"DeepSeek-R1 API error: {e}")
             raise
 
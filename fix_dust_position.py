@@ -4,8 +4,40 @@ Fix Dust Position - Clean up worthless positions and add minimum checks
 """
 import json
 import os
+import tempfile
 from loguru import logger
 
+# orjson handles large positions.json files several times faster than
+# stdlib json; fall back to stdlib if it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+
+def _atomic_write_json(path, obj):
+    """
+    Write JSON via tempfile + os.replace so a crash mid-write can never
+    leave a truncated file behind.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_json_dumps(obj))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
 def fix_dust_positions():
     """Remove dust positions (positions worth less than $1)"""
 
@@ -15,13 +47,12 @@ def fix_dust_positions():
     if not os.path.exists('positions.json'):
         logger.warning("No positions.json file found - positions only in memory")
         logger.info("Creating empty positions.json file")
-        with open('positions.json', 'w') as f:
-            json.dump({}, f, indent=2)
+        _atomic_write_json('positions.json', {})
         return
 
     # Load positions
-    with open('positions.json', 'r') as f:
-        positions = json.load(f)
+    with open('positions.json', 'rb') as f:
+        positions = _json_loads(f.read())
 
     if not positions:
         logger.info("No positions in file")
@@ -29,8 +60,8 @@ def fix_dust_positions():
 
     logger.info(f"Found {len(positions)} position(s)")
 
-    # Check each position
-    dust_positions = []
+    # Check each position, splitting into valid and dust in one pass
+    dust_positions = {}
     valid_positions = {}
 
     for symbol, pos in positions.items():
@@ -43,21 +74,19 @@ def fix_dust_positions():
         # Flag dust positions (worth less than $1)
         if position_value < 1.0:
             logger.warning(f"🗑️  DUST: {symbol} worth only ${position_value:.6f} - REMOVING")
-            dust_positions.append(symbol)
+            dust_positions[symbol] = pos
         else:
             valid_positions[symbol] = pos
             logger.success(f"✓ VALID: {symbol} worth ${position_value:.2f}")
 
     # Save cleaned positions
     if dust_positions:
-        logger.info(f"Removing {len(dust_positions)} dust position(s): {dust_positions}")
-
-        with open('positions.json', 'w') as f:
-            json.dump(valid_positions, f, indent=2)
+        logger.info(f"Removing {len(dust_positions)} dust position(s): {list(dust_positions)}")
 
-        # Backup removed positions
-        with open('dust_positions_backup.json', 'w') as f:
-            json.dump({sym: positions[sym] for sym in dust_positions}, f, indent=2)
+        # Backup first, then replace positions.json; both writes are
+        # atomic so a crash can't lose positions without a backup
+        _atomic_write_json('dust_positions_backup.json', dust_positions)
+        _atomic_write_json('positions.json', valid_positions)
 
         logger.success(f"✅ Cleaned! Removed {len(dust_positions)} dust position(s)")
         logger.info(f"Backup saved to dust_positions_backup.json")
@@ -0,0 +1,119 @@
+"""
+Shared Async HTTP Client
+One connection pool for all outbound API calls (DeepSeek, Telegram)
+"""
+import asyncio
+import threading
+import time
+
+import aiohttp
+
+# One session per event loop: aiohttp sessions are loop-bound, and this
+# app runs several loops at once (the alerter's background thread, the
+# engine's per-call loops), so a single shared session would end up with
+# a connector attached to somebody else's loop. Guarded by a plain lock
+# because callers come from different threads.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class AsyncTokenBucket:
+    """
+    Async token bucket for proactive rate limiting.
+
+    Tokens refill continuously at max_rate per time_period; acquire()
+    blocks until enough are available. Pacing requests up front keeps
+    throughput at the quota instead of bursting into 429s and then
+    serializing on exponential backoff.
+
+    Loop-agnostic: the counters are guarded by a threading.Lock that is
+    never held across an await (an asyncio.Lock binds to the first loop
+    that awaits it, and this app drives calls from several loops), so
+    one bucket can pace callers on any mix of loops and threads.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, amount: float = 1):
+        # A single oversized request should wait for a full bucket, not hang
+        amount = min(amount, self.max_rate)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._last) * self.max_rate / self.time_period
+                )
+                self._last = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) * self.time_period / self.max_rate
+            await asyncio.sleep(wait)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Lazily create the shared aiohttp session for the running loop.
+
+    Must be called from a running event loop. Components on the same loop
+    share one connector so DNS lookups, TLS tunnels, and file descriptors
+    are pooled instead of each client maintaining its own.
+
+    Each loop gets its own session, and a session belonging to another
+    live loop is never touched — closing it from here would yank it out
+    from under that loop's in-flight requests. Owners of short-lived
+    loops must await close_session() before closing their loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=16,
+                limit_per_host=8,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+        )
+        _sessions[loop] = session
+
+        # Safety net for owners that closed their loop without calling
+        # close_session(): the loop is gone, so gracefully closing the
+        # session is no longer possible — detach it and close the
+        # connector directly to release the leftover sockets
+        for stale_loop in [l for l in _sessions if l.is_closed()]:
+            stale = _sessions.pop(stale_loop)
+            if not stale.closed:
+                connector = stale.connector
+                stale.detach()
+                if connector is not None:
+                    try:
+                        connector.close()
+                    except Exception:
+                        # Transports on a closed loop may refuse even a
+                        # non-graceful close; nothing more we can do
+                        pass
+    return session
+
+
+async def close_session():
+    """
+    Close the running loop's shared session.
+
+    Every loop owner should await this before closing its loop — the
+    alerter on shutdown, and the engine's per-call loops before
+    loop.close().
+    """
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
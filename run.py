@@ -1266,17 +1266,23 @@ def analyze_symbol(symbol):
 
         # Get AI analysis
         import asyncio
+        import http_client
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        ai_result = loop.run_until_complete(
-            trading_engine.ai_ensemble.generate_signal(
-                symbol=symbol,
-                current_price=current_price,
-                candles=candles,
-                technical_indicators=technical_indicators
+        try:
+            ai_result = loop.run_until_complete(
+                trading_engine.ai_ensemble.generate_signal(
+                    symbol=symbol,
+                    current_price=current_price,
+                    candles=candles,
+                    technical_indicators=technical_indicators
+                )
             )
-        )
-        loop.close()
+        finally:
+            # Release this loop's pooled HTTP session before the loop
+            # (and its transports) goes away
+            loop.run_until_complete(http_client.close_session())
+            loop.close()
 
         return jsonify({
             'success': True,
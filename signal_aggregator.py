@@ -2,10 +2,35 @@
 Signal Aggregator - Collects and evaluates trading signals across multiple strategies and timeframes
 """
 
+from collections import namedtuple
+
+import numpy as np
 from loguru import logger
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from trading_config import STRATEGY_CONFIGS, get_strategy_config, should_check_strategy
+from signal_math import compute_context
+from caching import TTLCache
+
+# Fixed OHLCV schema: tuple-unpack into this instead of rebuilding a
+# six-key dict display per candle in the hot packaging path
+Candle = namedtuple('Candle', 'timestamp open high low close volume')
+
+# Priority ranking (higher = more important)
+_STRATEGY_PRIORITY = {
+    'macd_supertrend': 4,   # Swing trades highest priority (best risk/reward)
+    'momentum': 3,           # Day trades good priority
+    'mean_reversion': 2,     # Mean reversion moderate
+    'scalping': 1            # Scalping lowest (noisiest)
+}
+
+# Typed scoring table built once at import: strategy name -> dense id,
+# priorities in an array indexed by that id, so the scoring batch stays
+# in numpy instead of hashing dict keys per signal
+_STRAT_IDS = {name: i for i, name in enumerate(_STRATEGY_PRIORITY)}
+_PRIOS = np.fromiter(_STRATEGY_PRIORITY.values(), np.float64, count=len(_STRATEGY_PRIORITY))
 
 class SignalAggregator:
     """
@@ -13,10 +38,60 @@ class SignalAggregator:
     Prepares comprehensive analysis for AI decision-making
     """
 
+    # Shared pool: per-strategy evaluation is dominated by the OHLCV
+    # fetch, so running strategies concurrently hides the network latency
+    _eval_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='signal-eval')
+
     def __init__(self, exchange):
         self.exchange = exchange
         self.last_check_times = {}  # Track when each strategy was last checked
         self.recent_signals = {}    # Cache recent signals
+        self._state_lock = threading.Lock()  # Guards caches across worker threads
+        # OHLCV keyed by (symbol, timeframe): strategies sharing a
+        # timeframe reuse one fetch, and nearby cycles reuse it too
+        self._ohlcv_cache = TTLCache(maxsize=1024, ttl=30)
+        # Packaged context (stats + recent_candles) keyed by the candle
+        # window: strategies triggering on the same bar share one build
+        self._context_cache = TTLCache(maxsize=1024, ttl=30)
+        # Frozen (name, config) plan per strategy list: the config
+        # lookups and enabled checks are stable data, no need to redo
+        # them every tick
+        self._pair_plan_cache = {}
+
+    def _pair_plan(self, pair_config):
+        """Resolve a pair's enabled strategies to (name, config) once."""
+        key = tuple(pair_config.get('strategies', ()))
+        plan = self._pair_plan_cache.get(key)
+        if plan is None:
+            plan = [
+                (name, config)
+                for name in key
+                for config in [get_strategy_config(name)]
+                if config and config.get('enabled', True)
+            ]
+            self._pair_plan_cache[key] = plan
+        return plan
+
+    def _fetch_ohlcv_cached(self, symbol, timeframe):
+        """
+        Fetch OHLCV once per (symbol, timeframe) per 30s window.
+
+        Converted to a float64 ndarray at this edge: one bulk conversion
+        replaces per-candle boxed-float iteration in every downstream
+        consumer, and the cached copy is the array itself.
+        """
+        key = (symbol, timeframe)
+        with self._state_lock:
+            cached = self._ohlcv_cache.get(key)
+        if cached is not None:
+            logger.debug("Using cached {} ohlcv for {}", timeframe, symbol)
+            return cached
+        ohlcv = np.asarray(
+            self.exchange.fetch_ohlcv(symbol, timeframe, limit=100), dtype=np.float64
+        )
+        with self._state_lock:
+            self._ohlcv_cache.set(key, ohlcv)
+        return ohlcv
 
     def collect_all_signals(self, symbol, pair_config, strategy_evaluator):
         """
@@ -24,98 +99,159 @@ class SignalAggregator:
         Returns list of signal objects with full context
         """
         current_time = time.time()
-        enabled_strategies = pair_config.get('strategies', [])
+        # One ISO timestamp per collection cycle: every signal in this
+        # batch lands within microseconds, so formatting it per package
+        # is wasted work
+        timestamp_iso = datetime.now().isoformat()
+        plan = self._pair_plan(pair_config)
         all_signals = []
 
-        logger.debug(f"Collecting signals for {symbol} from {len(enabled_strategies)} strategies")
+        logger.debug("Collecting signals for {} from {} strategies", symbol, len(plan))
 
-        for strategy_name in enabled_strategies:
+        # Filter first, then evaluate the survivors concurrently
+        to_run = []
+        for strategy_name, config in plan:
             # Check if this strategy should run now (based on its interval)
             if not should_check_strategy(strategy_name, self.last_check_times, current_time):
-                logger.debug(f"Skipping {strategy_name} - not time to check yet")
-                continue
-
-            # Get strategy configuration
-            config = get_strategy_config(strategy_name)
-            if not config or not config.get('enabled', True):
+                logger.debug("Skipping {} - not time to check yet", strategy_name)
                 continue
 
-            try:
-                # Fetch data for this strategy's timeframe
-                timeframe = config['timeframe']
-                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=100)
-
-                if len(ohlcv) < 20:
-                    logger.warning(f"{strategy_name}: Not enough {timeframe} data for {symbol}")
-                    continue
-
-                # Get current price
-                current_price = ohlcv[-1][4]  # Last close
-
-                # Evaluate strategy on its timeframe
-                buy_signal = strategy_evaluator(symbol, current_price, [strategy_name], 'BUY', ohlcv)
-                sell_signal = strategy_evaluator(symbol, current_price, [strategy_name], 'SELL', ohlcv)
-
-                # If signal detected, package it with full context
-                if buy_signal:
-                    signal = self._create_signal_package(
-                        symbol=symbol,
-                        strategy=strategy_name,
-                        action='BUY',
-                        price=current_price,
-                        timeframe=timeframe,
-                        config=config,
-                        ohlcv=ohlcv
-                    )
-                    all_signals.append(signal)
-                    logger.info(f"📊 {strategy_name} BUY signal on {timeframe}: {symbol} @ ${current_price:.6f}")
-
-                elif sell_signal:
-                    signal = self._create_signal_package(
-                        symbol=symbol,
-                        strategy=strategy_name,
-                        action='SELL',
-                        price=current_price,
-                        timeframe=timeframe,
-                        config=config,
-                        ohlcv=ohlcv
-                    )
-                    all_signals.append(signal)
-                    logger.info(f"📊 {strategy_name} SELL signal on {timeframe}: {symbol} @ ${current_price:.6f}")
-
-                # Update last check time for this strategy
-                self.last_check_times[strategy_name] = current_time
-
-            except Exception as e:
-                logger.error(f"Error collecting signal from {strategy_name}: {e}")
+            to_run.append((strategy_name, config))
+
+        if to_run:
+            futures = {
+                self._eval_pool.submit(
+                    self._evaluate_one, symbol, strategy_name, config, strategy_evaluator,
+                    timestamp_iso
+                ): strategy_name
+                for strategy_name, config in to_run
+            }
+            for future in as_completed(futures):
+                strategy_name = futures[future]
+                try:
+                    all_signals.extend(future.result())
+                    # Update last check time for this strategy
+                    with self._state_lock:
+                        self.last_check_times[strategy_name] = current_time
+                except Exception as e:
+                    logger.error("Error collecting signal from {}: {}", strategy_name, e)
 
         if all_signals:
-            logger.success(f"✅ Collected {len(all_signals)} signal(s) for {symbol}")
+            logger.success("✅ Collected {} signal(s) for {}", len(all_signals), symbol)
         else:
-            logger.debug(f"No signals for {symbol} at this time")
+            logger.debug("No signals for {} at this time", symbol)
 
         return all_signals
 
-    def _create_signal_package(self, symbol, strategy, action, price, timeframe, config, ohlcv):
+    def _evaluate_one(self, symbol, strategy_name, config, strategy_evaluator,
+                      timestamp_iso=None):
         """
-        Create a comprehensive signal package with all context
+        Fetch, evaluate, and package one strategy's signals.
+
+        Runs on the evaluation pool; returns a (possibly empty) list of
+        signal dicts.
         """
-        # Calculate some basic technical indicators for context
-        closes = [c[4] for c in ohlcv]
-        highs = [c[2] for c in ohlcv]
-        lows = [c[3] for c in ohlcv]
+        # Fetch data for this strategy's timeframe (already a float64
+        # array; candle rows still index like the old lists)
+        timeframe = config['timeframe']
+        arr = self._fetch_ohlcv_cached(symbol, timeframe)
 
-        sma_20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else price
-        sma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else sma_20
+        if len(arr) < 20:
+            logger.warning("{}: Not enough {} data for {}", strategy_name, timeframe, symbol)
+            return []
 
-        # Recent price action
-        price_change_5 = ((closes[-1] - closes[-5]) / closes[-5] * 100) if len(closes) >= 5 else 0
-        price_change_20 = ((closes[-1] - closes[-20]) / closes[-20] * 100) if len(closes) >= 20 else 0
+        # Get current price (plain float: ends up in JSON payloads)
+        current_price = float(arr[-1, 4])  # Last close
+
+        # Evaluate strategy on its timeframe. Single-call contract:
+        # evaluators may return {'action': 'BUY'|'SELL'|None} from one
+        # pass over the indicator stack instead of recomputing it per
+        # direction. Legacy bool evaluators still work, and since BUY
+        # and SELL are exclusive the SELL call is skipped when BUY fires.
+        verdict = strategy_evaluator(symbol, current_price, [strategy_name], 'BUY', arr)
+        if isinstance(verdict, dict):
+            action = verdict.get('action')
+        elif verdict:
+            action = 'BUY'
+        elif strategy_evaluator(symbol, current_price, [strategy_name], 'SELL', arr):
+            action = 'SELL'
+        else:
+            action = None
 
-        # Volatility
-        recent_high = max(highs[-20:]) if len(highs) >= 20 else price
-        recent_low = min(lows[-20:]) if len(lows) >= 20 else price
-        volatility = ((recent_high - recent_low) / recent_low * 100) if recent_low > 0 else 0
+        # If signal detected, package it with full context
+        if not action:
+            return []
+
+        signal = self._create_signal_package(
+            symbol=symbol,
+            strategy=strategy_name,
+            action=action,
+            price=current_price,
+            timeframe=timeframe,
+            config=config,
+            ohlcv=arr,
+            arr=arr,
+            context=self._shared_context(symbol, timeframe, current_price, arr),
+            timestamp_iso=timestamp_iso
+        )
+        logger.info("📊 {} {} signal on {}: {} @ ${:.6f}", strategy_name, action, timeframe, symbol, current_price)
+        return [signal]
+
+    def _shared_context(self, symbol, timeframe, price, arr):
+        """
+        Build (or reuse) the candle-window-invariant part of a signal
+        package: the context stats and the recent_candles dicts.
+
+        Keyed by the last candle, so every strategy that triggers on the
+        same (symbol, timeframe) bar shares one build instead of
+        recomputing and re-allocating per signal.
+        """
+        key = (symbol, timeframe, arr[-1, 0], arr.shape[0])
+        with self._state_lock:
+            cached = self._context_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Basic technical indicators for context: one fused kernel pass
+        # (JIT-compiled when numba is installed, NumPy reductions otherwise)
+        (sma_20, sma_50, price_change_5, price_change_20,
+         recent_high, recent_low, volatility) = compute_context(arr, price)
+
+        context = {
+            'technical_context': {
+                'current_price': price,
+                'sma_20': sma_20,
+                'sma_50': sma_50,
+                'price_vs_sma20': ((price - sma_20) / sma_20 * 100),
+                'price_vs_sma50': ((price - sma_50) / sma_50 * 100),
+                'price_change_5_candles': price_change_5,
+                'price_change_20_candles': price_change_20,
+                'volatility_percent': volatility
+            },
+            'recent_candles': [
+                Candle(*(round(v, 6) for v in c))._asdict()
+                for c in arr[-10:].tolist()
+            ],
+        }
+        with self._state_lock:
+            self._context_cache.set(key, context)
+        return context
+
+    def _create_signal_package(self, symbol, strategy, action, price, timeframe, config, ohlcv,
+                               arr=None, context=None, timestamp_iso=None):
+        """
+        Create a comprehensive signal package with all context
+
+        `arr` is the ohlcv data as a float64 array; callers that already
+        converted it (collect_all_signals) pass it in to avoid redoing it.
+        `context` is the shared per-(symbol, timeframe) bundle from
+        _shared_context; only the strategy-specific fields are filled in
+        here.
+        """
+        if arr is None:
+            arr = np.asarray(ohlcv, dtype=np.float64)
+        if context is None:
+            context = self._shared_context(symbol, timeframe, price, arr)
 
         signal = {
             'symbol': symbol,
@@ -124,7 +260,7 @@ class SignalAggregator:
             'action': action,
             'price': price,
             'timeframe': timeframe,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp_iso or datetime.now().isoformat(),
 
             # Risk parameters for this strategy
             'risk_params': {
@@ -137,33 +273,16 @@ class SignalAggregator:
                 'trailing_distance': config.get('trailing_distance')
             },
 
-            # Technical context
-            'technical_context': {
-                'current_price': price,
-                'sma_20': sma_20,
-                'sma_50': sma_50,
-                'price_vs_sma20': ((price - sma_20) / sma_20 * 100),
-                'price_vs_sma50': ((price - sma_50) / sma_50 * 100),
-                'price_change_5_candles': price_change_5,
-                'price_change_20_candles': price_change_20,
-                'volatility_percent': volatility
-            },
+            # Technical context: shared per-bar dict (read-only downstream)
+            'technical_context': context['technical_context'],
 
-            # Recent candles (last 10 for AI pattern recognition)
-            'recent_candles': [
-                {
-                    'timestamp': c[0],
-                    'open': c[1],
-                    'high': c[2],
-                    'low': c[3],
-                    'close': c[4],
-                    'volume': c[5]
-                }
-                for c in ohlcv[-10:]
-            ],
+            # Recent candles (last 10 for AI pattern recognition);
+            # consumers still see plain dicts keyed by OHLCV field
+            'recent_candles': context['recent_candles'],
 
-            # Strategy description
-            'strategy_description': config['description']
+            # Short strategy tag; the full prose description only padded
+            # the prompt (the AI already gets risk params and context)
+            'strat_tag': strategy
         }
 
         return signal
@@ -176,40 +295,34 @@ class SignalAggregator:
         if not signals:
             return []
 
-        # Priority ranking (higher = more important)
-        strategy_priority = {
-            'macd_supertrend': 4,   # Swing trades highest priority (best risk/reward)
-            'momentum': 3,           # Day trades good priority
-            'mean_reversion': 2,     # Mean reversion moderate
-            'scalping': 1            # Scalping lowest (noisiest)
-        }
-
-        def signal_score(signal):
-            """Calculate priority score for a signal"""
-            score = 0
-
-            # Strategy base priority
-            score += strategy_priority.get(signal['strategy'], 0) * 10
-
-            # Stronger moves get bonus
-            technical = signal['technical_context']
-            price_change = abs(technical['price_change_20_candles'])
-            score += min(price_change, 10)  # Up to +10 for strong moves
-
-            # Trend alignment bonus
-            if abs(technical['price_vs_sma20']) > 2:
-                score += 5  # Price strongly above/below SMA
-
-            # Lower volatility bonus (more predictable)
-            if technical['volatility_percent'] < 5:
-                score += 3
-
-            return score
-
-        # Sort by score (highest first)
-        sorted_signals = sorted(signals, key=signal_score, reverse=True)
-
-        return sorted_signals
+        n = len(signals)
+        # Score components as vectorized passes instead of a comparator
+        # closure invoked N log N times
+        idx = np.fromiter(
+            (_STRAT_IDS.get(s['strategy'], -1) for s in signals), np.intp, count=n
+        )
+        prios = np.where(idx >= 0, _PRIOS[idx], 0.0)
+        pc20 = np.fromiter(
+            (abs(s['technical_context']['price_change_20_candles']) for s in signals),
+            float, count=n
+        )
+        sma20_dev = np.fromiter(
+            (abs(s['technical_context']['price_vs_sma20']) for s in signals), float, count=n
+        )
+        vol = np.fromiter(
+            (s['technical_context']['volatility_percent'] for s in signals), float, count=n
+        )
+
+        scores = (
+            prios * 10                      # Strategy base priority
+            + np.minimum(pc20, 10)          # Up to +10 for strong moves
+            + 5 * (sma20_dev > 2)           # Price strongly above/below SMA
+            + 3 * (vol < 5)                 # Lower volatility (more predictable)
+        )
+
+        # Sort by score (highest first; stable to keep tie order deterministic)
+        order = np.argsort(-scores, kind='stable')
+        return [signals[i] for i in order]
 
     def get_signal_summary(self, signals):
         """
@@ -0,0 +1,138 @@
+"""
+Signal Math Kernels
+Single-pass technical-context statistics, JIT-compiled when numba is available
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    # numba is optional: fall back to a no-op decorator so this module
+    # always imports, and route callers to the NumPy path instead
+    _HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _context_kernel(closes, highs, lows, price):
+    """
+    One fused pass over the array tails: both SMA sums and the 20-window
+    extrema accumulate in a single loop, no intermediate slices.
+    """
+    n = closes.shape[0]
+    m20 = 20 if n >= 20 else n
+    m50 = 50 if n >= 50 else n
+
+    sum20 = 0.0
+    sum50 = 0.0
+    hi = -1.0e308
+    lo = 1.0e308
+    for i in range(n - m50, n):
+        c = closes[i]
+        sum50 += c
+        if i >= n - m20:
+            sum20 += c
+            if highs[i] > hi:
+                hi = highs[i]
+            if lows[i] < lo:
+                lo = lows[i]
+
+    sma_20 = sum20 / 20.0 if n >= 20 else price
+    sma_50 = sum50 / 50.0 if n >= 50 else sma_20
+
+    last = closes[n - 1]
+    pc5 = (last - closes[n - 5]) / closes[n - 5] * 100.0 if n >= 5 else 0.0
+    pc20 = (last - closes[n - 20]) / closes[n - 20] * 100.0 if n >= 20 else 0.0
+
+    recent_high = hi if n >= 20 else price
+    recent_low = lo if n >= 20 else price
+    volatility = (recent_high - recent_low) / recent_low * 100.0 if recent_low > 0 else 0.0
+
+    return sma_20, sma_50, pc5, pc20, recent_high, recent_low, volatility
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _batch_context_kernel(tensor, prices, out):
+    """
+    Portfolio-wide contexts: symbols distributed over cores via prange,
+    each running the same fused one-pass accumulators.
+    """
+    for s in prange(tensor.shape[0]):
+        r = _context_kernel(
+            np.ascontiguousarray(tensor[s, :, 4]),
+            np.ascontiguousarray(tensor[s, :, 2]),
+            np.ascontiguousarray(tensor[s, :, 3]),
+            prices[s]
+        )
+        out[s, 0] = r[0]
+        out[s, 1] = r[1]
+        out[s, 2] = r[2]
+        out[s, 3] = r[3]
+        out[s, 4] = r[4]
+        out[s, 5] = r[5]
+        out[s, 6] = r[6]
+
+
+def compute_context_batch(tensor, prices):
+    """
+    Technical-context statistics for many symbols at once.
+
+    Args:
+        tensor: (n_symbols, n_candles, 6) OHLCV stack
+        prices: (n_symbols,) current prices
+
+    Returns:
+        (n_symbols, 7) float64 array; columns match compute_context's
+        return order
+    """
+    tensor = np.ascontiguousarray(tensor, dtype=np.float64)
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    out = np.empty((tensor.shape[0], 7), dtype=np.float64)
+    if _HAVE_NUMBA:
+        _batch_context_kernel(tensor, prices, out)
+    else:
+        for s in range(tensor.shape[0]):
+            out[s] = compute_context(tensor[s], prices[s])
+    return out
+
+
+def compute_context(arr, price):
+    """
+    Technical-context statistics for one OHLCV array.
+
+    Returns:
+        tuple: (sma_20, sma_50, price_change_5, price_change_20,
+                recent_high, recent_low, volatility_percent)
+    """
+    if _HAVE_NUMBA:
+        return _context_kernel(
+            np.ascontiguousarray(arr[:, 4]),
+            np.ascontiguousarray(arr[:, 2]),
+            np.ascontiguousarray(arr[:, 3]),
+            float(price)
+        )
+
+    # NumPy fallback: vectorized column reductions
+    closes = arr[:, 4]
+    n = closes.size
+    sma_20 = float(closes[-20:].mean()) if n >= 20 else price
+    sma_50 = float(closes[-50:].mean()) if n >= 50 else sma_20
+    last = float(closes[-1])
+    pc5 = float((last - closes[-5]) / closes[-5] * 100) if n >= 5 else 0.0
+    pc20 = float((last - closes[-20]) / closes[-20] * 100) if n >= 20 else 0.0
+    recent_high = float(arr[-20:, 2].max()) if n >= 20 else price
+    recent_low = float(arr[-20:, 3].min()) if n >= 20 else price
+    volatility = (recent_high - recent_low) / recent_low * 100 if recent_low > 0 else 0.0
+    return sma_20, sma_50, pc5, pc20, recent_high, recent_low, volatility
+
+
+if _HAVE_NUMBA:
+    # Warm-up: pay the JIT compile at import instead of on the first signal
+    _context_kernel(np.ones(50), np.ones(50), np.ones(50), 1.0)
+    _batch_context_kernel(np.ones((2, 50, 6)), np.ones(2), np.empty((2, 7)))
@@ -4,22 +4,79 @@ Stores all trades for performance analysis and AI feedback loops
 """
 import sqlite3
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
 from loguru import logger
 import os
 
+# Hot-path SQL as module constants: passing the same string object on
+# every call maximizes sqlite3's per-connection statement cache hits,
+# skipping the tokenizer/parser/planner for the write paths
+_SQL_INSERT_ENTRY = '''
+    INSERT INTO trades (
+        symbol, strategy, entry_price, quantity, entry_time,
+        ai_confidence, ai_reasoning, ai_position_size,
+        ai_stop_loss, ai_take_profit, market_regime, volatility_regime
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_UPDATE_EXIT = '''
+    UPDATE trades
+    SET exit_price = ?,
+        exit_time = ?,
+        pnl_usd = (? - entry_price) * quantity,
+        pnl_percent = ((? - entry_price) / entry_price) * 100,
+        outcome = CASE WHEN ? > entry_price THEN 'WIN' ELSE 'LOSS' END,
+        exit_reason = ?
+    WHERE id = ?
+    RETURNING pnl_usd, pnl_percent, symbol
+'''
+
+# The daily_stats rollup is kept current by the trades_exit_agg
+# trigger, so today's numbers are a single-row point read
+_SQL_TODAY = 'SELECT wins, losses, pnl_usd FROM daily_stats WHERE day = ?'
+
 class TradeHistory:
     """Persistent trade history with performance analytics."""
 
     def __init__(self, db_path='trade_history.db'):
         self.db_path = db_path
+        # One long-lived connection instead of connect/close per call:
+        # reopening pays WAL/shm file opens and a cold page cache every
+        # time. check_same_thread is off because the engine's worker
+        # threads share this handle; _write_lock serializes writes.
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                    isolation_level=None, cached_statements=256)
+        # Named column access: rows index by name instead of magic
+        # positions, so schema changes can't silently shift fields
+        self.conn.row_factory = sqlite3.Row
+        self._write_lock = threading.Lock()
+        self._prompt_cache = None  # (key, formatted section)
         self._init_database()
+        # Dedicated read-only connection for the analytics queries:
+        # under WAL it reads concurrently with writes and, being
+        # query_only, can never contend for the write lock
+        self.read_conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True,
+                                         check_same_thread=False,
+                                         cached_statements=256)
+        self.read_conn.row_factory = sqlite3.Row
+        self.read_conn.execute('PRAGMA query_only=1')
+        self._schedule_optimize()
         logger.success(f"✓ Trade history database initialized: {db_path}")
 
     def _init_database(self):
         """Initialize SQLite database schema."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
+
+        # Tuned for a small hot database with frequent point writes:
+        # WAL lets readers run during writes, NORMAL sync is safe under
+        # WAL, and the rest keep pages and temp data in memory
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-64000')
+        cursor.execute('PRAGMA mmap_size=268435456')
 
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trades (
@@ -49,9 +106,79 @@ class TradeHistory:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_exit_time ON trades(exit_time)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_strategy ON trades(strategy)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_outcome ON trades(outcome)')
+        # Partial index over closed trades only: the recent-performance
+        # ORDER BY exit_time DESC LIMIT N becomes a pure index walk
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_closed_trades
+            ON trades(exit_time DESC) WHERE exit_time IS NOT NULL
+        ''')
+        # Covering variant: the aggregate queries read only these
+        # columns, so SQLite can answer them without touching the table
+        # (ai_reasoning TEXT rows never get materialized)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_exit_cover
+            ON trades(exit_time, outcome, pnl_usd, pnl_percent, strategy, ai_confidence, symbol)
+            WHERE exit_time IS NOT NULL
+        ''')
 
-        conn.commit()
-        conn.close()
+        # Cold-column split: ai_reasoning is multi-KB AI prose that the
+        # analytics never read. Keeping it out of the hot table packs
+        # more trade rows per page; the legacy column stays for old rows
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trade_notes (
+                trade_id INTEGER PRIMARY KEY REFERENCES trades(id),
+                ai_reasoning TEXT
+            )
+        ''')
+
+        # Incrementally-maintained daily rollup: the trigger folds each
+        # newly closed trade into its day's row, turning the dashboard's
+        # today query into an O(1) point read instead of an index scan
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                day DATE PRIMARY KEY,
+                wins INTEGER NOT NULL DEFAULT 0,
+                losses INTEGER NOT NULL DEFAULT 0,
+                pnl_usd REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trades_exit_agg
+            AFTER UPDATE OF exit_time ON trades
+            WHEN OLD.exit_time IS NULL AND NEW.exit_time IS NOT NULL
+            BEGIN
+                INSERT INTO daily_stats (day, wins, losses, pnl_usd)
+                VALUES (DATE(NEW.exit_time),
+                        NEW.outcome = 'WIN',
+                        NEW.outcome = 'LOSS',
+                        COALESCE(NEW.pnl_usd, 0))
+                ON CONFLICT(day) DO UPDATE SET
+                    wins = wins + (NEW.outcome = 'WIN'),
+                    losses = losses + (NEW.outcome = 'LOSS'),
+                    pnl_usd = pnl_usd + COALESCE(NEW.pnl_usd, 0);
+            END
+        ''')
+        # One-time backfill for databases that closed trades before the
+        # rollup existed (only when daily_stats is still empty, so
+        # partially-counted days can never be double-counted)
+        if cursor.execute(
+            'SELECT NOT EXISTS (SELECT 1 FROM daily_stats)'
+        ).fetchone()[0]:
+            cursor.execute('''
+                INSERT INTO daily_stats (day, wins, losses, pnl_usd)
+                SELECT DATE(exit_time),
+                       SUM(outcome = 'WIN'),
+                       SUM(outcome = 'LOSS'),
+                       COALESCE(SUM(pnl_usd), 0)
+                FROM trades
+                WHERE exit_time IS NOT NULL
+                GROUP BY DATE(exit_time)
+            ''')
+
+        # Refresh query-planner statistics: the first call after index
+        # creation triggers the implicit ANALYZE, later calls keep
+        # sqlite_stat1 current as weeks of trades accumulate
+        cursor.execute('PRAGMA optimize')
 
     def record_entry(self, symbol: str, strategy: str, entry_price: float,
                      quantity: float, ai_result: dict):
@@ -68,38 +195,78 @@ class TradeHistory:
         Returns:
             trade_id: Database ID for this trade
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO trades (
-                symbol, strategy, entry_price, quantity, entry_time,
-                ai_confidence, ai_reasoning, ai_position_size,
-                ai_stop_loss, ai_take_profit, market_regime, volatility_regime
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            symbol,
-            strategy,
-            entry_price,
-            quantity,
-            datetime.now(),
-            ai_result.get('confidence', 0.0),
-            ai_result.get('reasoning', ''),
-            ai_result.get('position_size_percent', 0.0),
-            ai_result.get('stop_loss_percent', 0.0),
-            ai_result.get('take_profit_percent', 0.0),
-            ai_result.get('market_regime', 'UNKNOWN'),
-            ai_result.get('volatility_regime', 'UNKNOWN')
-        ))
-
-        trade_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        reasoning = ai_result.get('reasoning', '')
+        with self._write_lock:
+            try:
+                self.conn.execute('BEGIN')
+                cursor = self.conn.execute(_SQL_INSERT_ENTRY, (
+                    symbol,
+                    strategy,
+                    entry_price,
+                    quantity,
+                    # Pre-formatted ISO string: skips sqlite3's per-call
+                    # datetime adapter (deprecated since Python 3.12) while
+                    # writing the exact same stored representation
+                    datetime.now().isoformat(sep=' '),
+                    ai_result.get('confidence', 0.0),
+                    '',  # prose lives in trade_notes, not the hot table
+                    ai_result.get('position_size_percent', 0.0),
+                    ai_result.get('stop_loss_percent', 0.0),
+                    ai_result.get('take_profit_percent', 0.0),
+                    ai_result.get('market_regime', 'UNKNOWN'),
+                    ai_result.get('volatility_regime', 'UNKNOWN')
+                ))
+
+                trade_id = cursor.lastrowid
+                if reasoning:
+                    self.conn.execute(
+                        'INSERT INTO trade_notes (trade_id, ai_reasoning) VALUES (?, ?)',
+                        (trade_id, reasoning)
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
 
         logger.info(f"📝 Trade entry recorded: ID={trade_id}, {symbol}")
         return trade_id
 
+    def get_reasoning(self, trade_id: int):
+        """Fetch the AI reasoning text for one trade (side table, with
+        fallback to the legacy inline column for pre-split rows)."""
+        row = self.read_conn.execute('''
+            SELECT COALESCE(n.ai_reasoning, t.ai_reasoning)
+            FROM trades t LEFT JOIN trade_notes n ON n.trade_id = t.id
+            WHERE t.id = ?
+        ''', (trade_id,)).fetchone()
+        return row[0] if row else None
+
+    def bulk_record(self, rows):
+        """
+        Batch-insert trade entries in one transaction.
+
+        Args:
+            rows: list of parameter tuples matching the entry INSERT
+                  (symbol, strategy, entry_price, quantity, entry_time,
+                  ai_confidence, ai_reasoning, ai_position_size,
+                  ai_stop_loss, ai_take_profit, market_regime,
+                  volatility_regime)
+
+        Backfill/replay scripts should accumulate rows and call this
+        instead of looping record_entry: executemany under a single
+        BEGIN/COMMIT pays one WAL commit for the whole batch rather than
+        one per row.
+        """
+        with self._write_lock:
+            try:
+                self.conn.execute('BEGIN')
+                self.conn.executemany(_SQL_INSERT_ENTRY, rows)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        logger.info(f"📝 Bulk-recorded {len(rows)} trade entries")
+
     def record_exit(self, trade_id: int, exit_price: float, exit_reason: str):
         """
         Record trade exit and calculate P&L.
@@ -109,39 +276,22 @@ class TradeHistory:
             exit_price: Exit price
             exit_reason: Reason for exit (STOP_LOSS, TAKE_PROFIT, STRATEGY, etc.)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get entry data
-        cursor.execute('''
-            SELECT entry_price, quantity, symbol
-            FROM trades
-            WHERE id = ?
-        ''', (trade_id,))
+        # One round trip: P&L is computed inside the UPDATE from the
+        # stored entry data, and RETURNING hands back the values to log.
+        # Single statement means a single WAL commit instead of the old
+        # SELECT-then-UPDATE pair
+        with self._write_lock:
+            row = self.conn.execute(
+                _SQL_UPDATE_EXIT,
+                (exit_price, datetime.now().isoformat(sep=' '), exit_price,
+                 exit_price, exit_price, exit_reason, trade_id)
+            ).fetchone()
 
-        row = cursor.fetchone()
         if not row:
             logger.error(f"Trade ID {trade_id} not found!")
-            conn.close()
             return
 
-        entry_price, quantity, symbol = row
-
-        # Calculate P&L
-        pnl_usd = (exit_price - entry_price) * quantity
-        pnl_percent = ((exit_price - entry_price) / entry_price) * 100
-        outcome = 'WIN' if pnl_usd > 0 else 'LOSS'
-
-        # Update record
-        cursor.execute('''
-            UPDATE trades
-            SET exit_price = ?, exit_time = ?, pnl_usd = ?,
-                pnl_percent = ?, outcome = ?, exit_reason = ?
-            WHERE id = ?
-        ''', (exit_price, datetime.now(), pnl_usd, pnl_percent, outcome, exit_reason, trade_id))
-
-        conn.commit()
-        conn.close()
+        pnl_usd, pnl_percent, symbol = row
 
         logger.info(f"📝 Trade exit recorded: ID={trade_id}, {symbol}, P&L: ${pnl_usd:+.2f} ({pnl_percent:+.2f}%)")
 
@@ -155,108 +305,123 @@ class TradeHistory:
         Returns:
             dict: Comprehensive performance metrics
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT * FROM trades
-            WHERE exit_time IS NOT NULL
-            ORDER BY exit_time DESC
-            LIMIT ?
-        ''', (limit,))
-
-        trades = cursor.fetchall()
-        conn.close()
-
-        if not trades:
+        # All aggregation happens in SQLite: each query pulls the same
+        # materialized window of recent closed trades and returns a
+        # handful of scalars instead of shipping whole rows to Python
+        recent_cte = '''
+            WITH recent AS MATERIALIZED (
+                SELECT symbol, strategy, pnl_usd, pnl_percent, outcome, ai_confidence
+                FROM trades
+                WHERE exit_time IS NOT NULL
+                ORDER BY exit_time DESC
+                LIMIT ?
+            )
+        '''
+
+        (total_trades, wins, avg_win, avg_loss,
+         total_wins, total_losses, total_pnl) = self.read_conn.execute(recent_cte + '''
+            SELECT COUNT(*),
+                   SUM(CASE WHEN outcome = 'WIN' THEN 1 ELSE 0 END),
+                   AVG(CASE WHEN outcome = 'WIN' THEN pnl_percent END),
+                   AVG(CASE WHEN outcome = 'LOSS' THEN pnl_percent END),
+                   SUM(CASE WHEN outcome = 'WIN' THEN CAST(ROUND(pnl_usd * 100) AS INTEGER) ELSE 0 END),
+                   SUM(CASE WHEN outcome = 'LOSS' THEN CAST(ROUND(pnl_usd * 100) AS INTEGER) ELSE 0 END),
+                   SUM(CAST(ROUND(pnl_usd * 100) AS INTEGER))
+            FROM recent
+        ''', (limit,)).fetchone()
+
+        # Dollar totals are summed as integer cents inside SQL: exact
+        # accumulation with no float drift over long histories
+        total_wins = (total_wins or 0) / 100.0
+        total_losses = (total_losses or 0) / 100.0
+        total_pnl = (total_pnl or 0) / 100.0
+
+        if not total_trades:
             logger.warning("No closed trades found for performance analysis")
             return None
 
-        # Parse trades
-        total_trades = len(trades)
-        wins = sum(1 for t in trades if t[10] == 'WIN')  # outcome column
         win_rate = (wins / total_trades) * 100
 
-        # Calculate average win/loss
-        winning_trades = [t for t in trades if t[10] == 'WIN']
-        losing_trades = [t for t in trades if t[10] == 'LOSS']
-
-        avg_win = sum(t[9] for t in winning_trades) / len(winning_trades) if winning_trades else 0  # pnl_percent
-        avg_loss = sum(t[9] for t in losing_trades) / len(losing_trades) if losing_trades else 0
-
         # Profit factor
-        total_wins = sum(t[8] for t in winning_trades)  # pnl_usd
-        total_losses = abs(sum(t[8] for t in losing_trades))
+        total_losses = abs(total_losses)
         profit_factor = total_wins / total_losses if total_losses > 0 else 0
 
-        # Strategy performance
+        # Strategy performance; best/worst tracked inline so the prompt
+        # helper doesn't rescan the dict with max()/min() afterwards
         strategy_stats = {}
-        for trade in trades:
-            strategy = trade[2]
-            if strategy not in strategy_stats:
-                strategy_stats[strategy] = {'wins': 0, 'total': 0}
-
-            strategy_stats[strategy]['total'] += 1
-            if trade[10] == 'WIN':
-                strategy_stats[strategy]['wins'] += 1
-
-        for strategy in strategy_stats:
-            stats = strategy_stats[strategy]
-            stats['win_rate'] = (stats['wins'] / stats['total']) * 100 if stats['total'] > 0 else 0
-
-        # Confidence calibration
+        best_strategy = worst_strategy = None
+        for strategy, s_total, s_wins in self.read_conn.execute(recent_cte + '''
+            SELECT strategy, COUNT(*), SUM(CASE WHEN outcome = 'WIN' THEN 1 ELSE 0 END)
+            FROM recent
+            GROUP BY strategy
+        ''', (limit,)):
+            stats = {
+                'wins': s_wins,
+                'total': s_total,
+                'win_rate': (s_wins / s_total) * 100 if s_total > 0 else 0
+            }
+            strategy_stats[strategy] = stats
+            if best_strategy is None or stats['win_rate'] > best_strategy[1]['win_rate']:
+                best_strategy = (strategy, stats)
+            if worst_strategy is None or stats['win_rate'] < worst_strategy[1]['win_rate']:
+                worst_strategy = (strategy, stats)
+
+        # Confidence calibration (trades below 55% land in the top
+        # bucket via the ELSE arm, matching the original bucketing)
         confidence_buckets = {
-            '55-65': {'correct': 0, 'total': 0, 'wins': 0},
-            '66-75': {'correct': 0, 'total': 0, 'wins': 0},
-            '76-100': {'correct': 0, 'total': 0, 'wins': 0}
+            '55-65': {'correct': 0, 'total': 0, 'wins': 0, 'win_rate': 0},
+            '66-75': {'correct': 0, 'total': 0, 'wins': 0, 'win_rate': 0},
+            '76-100': {'correct': 0, 'total': 0, 'wins': 0, 'win_rate': 0}
         }
-
-        for trade in trades:
-            confidence = trade[11] * 100 if trade[11] else 0  # ai_confidence
-            outcome = trade[10]
-
-            if 55 <= confidence < 66:
-                bucket = '55-65'
-            elif 66 <= confidence < 76:
-                bucket = '66-75'
-            else:
-                bucket = '76-100'
-
-            confidence_buckets[bucket]['total'] += 1
-            if outcome == 'WIN':
-                confidence_buckets[bucket]['wins'] += 1
-
-        for bucket in confidence_buckets:
+        for bucket, b_total, b_wins in self.read_conn.execute(recent_cte + '''
+            SELECT CASE
+                       WHEN COALESCE(ai_confidence, 0) * 100 < 55 THEN '76-100'
+                       WHEN COALESCE(ai_confidence, 0) * 100 < 66 THEN '55-65'
+                       WHEN COALESCE(ai_confidence, 0) * 100 < 76 THEN '66-75'
+                       ELSE '76-100'
+                   END AS bucket,
+                   COUNT(*),
+                   SUM(CASE WHEN outcome = 'WIN' THEN 1 ELSE 0 END)
+            FROM recent
+            GROUP BY bucket
+        ''', (limit,)):
             stats = confidence_buckets[bucket]
-            if stats['total'] > 0:
-                stats['win_rate'] = (stats['wins'] / stats['total']) * 100
-            else:
-                stats['win_rate'] = 0
-
-        # Best and worst trades
-        best_trade = max(trades, key=lambda t: t[9] if t[9] else -999)  # pnl_percent
-        worst_trade = min(trades, key=lambda t: t[9] if t[9] else 999)
+            stats['total'] = b_total
+            stats['wins'] = b_wins
+            stats['win_rate'] = (b_wins / b_total) * 100 if b_total > 0 else 0
+
+        # Best and worst trades (COALESCE mirrors the old None fallbacks)
+        best_trade = self.read_conn.execute(recent_cte + '''
+            SELECT symbol, pnl_percent, strategy FROM recent
+            ORDER BY COALESCE(pnl_percent, -999) DESC LIMIT 1
+        ''', (limit,)).fetchone()
+        worst_trade = self.read_conn.execute(recent_cte + '''
+            SELECT symbol, pnl_percent, strategy FROM recent
+            ORDER BY COALESCE(pnl_percent, 999) ASC LIMIT 1
+        ''', (limit,)).fetchone()
 
         return {
             'total_trades': total_trades,
             'wins': wins,
             'losses': total_trades - wins,
             'win_rate': win_rate,
-            'avg_win_percent': avg_win,
-            'avg_loss_percent': avg_loss,
+            'avg_win_percent': avg_win or 0,
+            'avg_loss_percent': avg_loss or 0,
             'profit_factor': profit_factor,
-            'total_pnl_usd': sum(t[8] for t in trades if t[8]),
+            'total_pnl_usd': total_pnl,
             'strategy_performance': strategy_stats,
+            'best_strategy': best_strategy or ('Unknown', {'win_rate': 0}),
+            'worst_strategy': worst_strategy or ('Unknown', {'win_rate': 0}),
             'confidence_calibration': confidence_buckets,
             'best_trade': {
-                'symbol': best_trade[1],
-                'pnl_percent': best_trade[9],
-                'strategy': best_trade[2]
+                'symbol': best_trade['symbol'],
+                'pnl_percent': best_trade['pnl_percent'],
+                'strategy': best_trade['strategy']
             },
             'worst_trade': {
-                'symbol': worst_trade[1],
-                'pnl_percent': worst_trade[9],
-                'strategy': worst_trade[2]
+                'symbol': worst_trade['symbol'],
+                'pnl_percent': worst_trade['pnl_percent'],
+                'strategy': worst_trade['strategy']
             }
         }
 
@@ -267,98 +432,87 @@ class TradeHistory:
         Returns:
             str: Formatted performance summary for AI context
         """
+        # The section only changes when a trade closes, so memoize on
+        # the latest exit_time: MAX over idx_exit_time is a single
+        # B-tree descent, far cheaper than re-aggregating and
+        # re-formatting for every concurrent symbol evaluation
+        last_exit = self.read_conn.execute(
+            'SELECT MAX(exit_time) FROM trades'
+        ).fetchone()[0]
+        cache_key = (limit, last_exit)
+        if self._prompt_cache and self._prompt_cache[0] == cache_key:
+            return self._prompt_cache[1]
+
         perf = self.get_recent_performance(limit)
 
         if not perf:
-            return "\n**NO HISTORICAL PERFORMANCE DATA AVAILABLE**\n"
-
-        # Find best and worst strategies
-        if perf['strategy_performance']:
-            best_strategy = max(perf['strategy_performance'].items(),
-                              key=lambda x: x[1]['win_rate'])
-            worst_strategy = min(perf['strategy_performance'].items(),
-                                key=lambda x: x[1]['win_rate'])
-        else:
-            best_strategy = ('Unknown', {'win_rate': 0})
-            worst_strategy = ('Unknown', {'win_rate': 0})
-
-        strategy_breakdown = "\n".join([
-            f"  - {strategy.replace('_', ' ').title()}: {stats['win_rate']:.1f}% ({stats['wins']}/{stats['total']} trades)"
+            section = "\n**NO HISTORICAL PERFORMANCE DATA AVAILABLE**\n"
+            self._prompt_cache = (cache_key, section)
+            return section
+
+        # Best and worst strategies come precomputed from the stats pass
+        best_strategy = perf['best_strategy']
+        worst_strategy = perf['worst_strategy']
+
+        # One flat list joined once at the end: no intermediate breakdown
+        # strings get allocated just to be spliced into a bigger literal.
+        # Pre-bound .format avoids re-parsing the row template per line
+        strategy_line = "  - {}: {:.1f}% ({}/{} trades)".format
+        confidence_line = "  - {}% confidence: {:.1f}% accurate ({}/{} trades)".format
+
+        out = [
+            "",
+            f"**YOUR RECENT PERFORMANCE (LAST {perf['total_trades']} TRADES):**",
+            f"- Overall Win Rate: {perf['win_rate']:.1f}%",
+            f"- Wins: {perf['wins']} | Losses: {perf['losses']}",
+            f"- Average Win: +{perf['avg_win_percent']:.2f}%",
+            f"- Average Loss: {perf['avg_loss_percent']:.2f}%",
+            f"- Profit Factor: {perf['profit_factor']:.2f}",
+            f"- Total P&L: ${perf['total_pnl_usd']:+.2f}",
+            "",
+            "**PERFORMANCE BY STRATEGY:**",
+        ]
+        out.extend(
+            strategy_line(strategy.replace('_', ' ').title(),
+                          stats['win_rate'], stats['wins'], stats['total'])
             for strategy, stats in perf['strategy_performance'].items()
-        ])
-
-        confidence_breakdown = "\n".join([
-            f"  - {bucket}% confidence: {stats['win_rate']:.1f}% accurate ({stats['wins']}/{stats['total']} trades)"
+        )
+        out.append("")
+        out.append("**CONFIDENCE CALIBRATION:**")
+        out.extend(
+            confidence_line(bucket, stats['win_rate'], stats['wins'], stats['total'])
             for bucket, stats in perf['confidence_calibration'].items()
             if stats['total'] > 0
+        )
+        out.extend([
+            "",
+            f"**BEST TRADE:** {perf['best_trade']['symbol']} +{perf['best_trade']['pnl_percent']:.2f}% ({perf['best_trade']['strategy']})",
+            f"**WORST TRADE:** {perf['worst_trade']['symbol']} {perf['worst_trade']['pnl_percent']:.2f}% ({perf['worst_trade']['strategy']})",
+            "",
+            "**LESSONS LEARNED:**",
+            f"- Your best strategy is {best_strategy[0].replace('_', ' ').title()} with {best_strategy[1]['win_rate']:.1f}% win rate",
+            f"- Your weakest strategy is {worst_strategy[0].replace('_', ' ').title()} with {worst_strategy[1]['win_rate']:.1f}% win rate",
+            "- Trust your high-confidence signals (they have proven more accurate)",
+            "- Be more selective with lower-confidence setups",
+            "",
         ])
+        prompt_section = "\n".join(out)
 
-        prompt_section = f"""
-**YOUR RECENT PERFORMANCE (LAST {perf['total_trades']} TRADES):**
-- Overall Win Rate: {perf['win_rate']:.1f}%
-- Wins: {perf['wins']} | Losses: {perf['losses']}
-- Average Win: +{perf['avg_win_percent']:.2f}%
-- Average Loss: {perf['avg_loss_percent']:.2f}%
-- Profit Factor: {perf['profit_factor']:.2f}
-- Total P&L: ${perf['total_pnl_usd']:+.2f}
-
-**PERFORMANCE BY STRATEGY:**
-{strategy_breakdown}
-
-**CONFIDENCE CALIBRATION:**
-{confidence_breakdown}
-
-**BEST TRADE:** {perf['best_trade']['symbol']} +{perf['best_trade']['pnl_percent']:.2f}% ({perf['best_trade']['strategy']})
-**WORST TRADE:** {perf['worst_trade']['symbol']} {perf['worst_trade']['pnl_percent']:.2f}% ({perf['worst_trade']['strategy']})
-
-**LESSONS LEARNED:**
-- Your best strategy is {best_strategy[0].replace('_', ' ').title()} with {best_strategy[1]['win_rate']:.1f}% win rate
-- Your weakest strategy is {worst_strategy[0].replace('_', ' ').title()} with {worst_strategy[1]['win_rate']:.1f}% win rate
-- Trust your high-confidence signals (they have proven more accurate)
-- Be more selective with lower-confidence setups
-"""
-
+        self._prompt_cache = (cache_key, prompt_section)
         return prompt_section
 
     def get_open_trades_count(self):
         """Get count of currently open trades."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT COUNT(*) FROM trades WHERE exit_time IS NULL')
-        count = cursor.fetchone()[0]
-
-        conn.close()
-        return count
+        return self.read_conn.execute(
+            'SELECT COUNT(*) FROM trades WHERE exit_time IS NULL'
+        ).fetchone()[0]
 
     def get_todays_performance(self):
         """Get today's trading performance."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        today = datetime.now().date().isoformat()
 
-        today = datetime.now().date()
-
-        cursor.execute('''
-            SELECT COUNT(*), SUM(pnl_usd), outcome
-            FROM trades
-            WHERE DATE(exit_time) = ?
-            GROUP BY outcome
-        ''', (today,))
-
-        results = cursor.fetchall()
-        conn.close()
-
-        wins = 0
-        losses = 0
-        total_pnl = 0
-
-        for row in results:
-            count, pnl, outcome = row
-            if outcome == 'WIN':
-                wins = count
-            elif outcome == 'LOSS':
-                losses = count
-            total_pnl += pnl if pnl else 0
+        row = self.read_conn.execute(_SQL_TODAY, (today,)).fetchone()
+        wins, losses, total_pnl = row if row else (0, 0, 0)
 
         total_trades = wins + losses
         win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
@@ -370,3 +524,28 @@ class TradeHistory:
             'win_rate': win_rate,
             'total_pnl': total_pnl
         }
+
+    def _schedule_optimize(self):
+        """Re-run PRAGMA optimize daily so planner stats never go stale."""
+        timer = threading.Timer(86400, self._optimize_tick)
+        timer.daemon = True
+        timer.start()
+        self._optimize_timer = timer
+
+    def _optimize_tick(self):
+        try:
+            with self._write_lock:
+                self.conn.execute('PRAGMA optimize=0x10002')
+        except Exception as e:
+            logger.warning(f"Daily PRAGMA optimize failed: {e}")
+        self._schedule_optimize()
+
+    def close(self):
+        """Close the database connections (run on shutdown)."""
+        self._optimize_timer.cancel()
+        self.read_conn.close()
+        with self._write_lock:
+            # Let SQLite refresh planner statistics before shutdown
+            self.conn.execute('PRAGMA optimize')
+            self.conn.close()
+        logger.info("Trade history database closed")
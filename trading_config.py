@@ -3,6 +3,8 @@ Multi-Timeframe Trading Configuration
 Defines strategy-specific timeframes and parameters
 """
 
+from types import MappingProxyType
+
 # ============================================
 # STRATEGY TIMEFRAME CONFIGURATIONS
 # ============================================
@@ -65,6 +67,10 @@ STRATEGY_CONFIGS = {
     }
 }
 
+# Read-only view: nothing in the codebase mutates strategy config at
+# runtime, so freeze it against accidental writes
+STRATEGY_CONFIGS = MappingProxyType(STRATEGY_CONFIGS)
+
 # ============================================
 # AI MULTI-TIMEFRAME ANALYSIS SETTINGS
 # ============================================
@@ -97,11 +103,11 @@ TRADING_LOOP_CONFIG = {
 
     # Track last check time for each strategy
     # Strategies checked at their specific intervals
-    'strategy_check_intervals': {
+    'strategy_check_intervals': MappingProxyType({
         strategy: config['check_interval']
         for strategy, config in STRATEGY_CONFIGS.items()
         if config.get('enabled', True)
-    }
+    })
 }
 
 # ============================================
@@ -147,12 +153,24 @@ POSITION_RULES = {
 # HELPER FUNCTIONS
 # ============================================
 
+# Pure functions of the frozen constants above, so computed exactly once
+# at import; the helpers below just return the cached results
+_ENABLED_STRATEGIES = [
+    strategy for strategy, config in STRATEGY_CONFIGS.items()
+    if config.get('enabled', True)
+]
+
+_UNIQUE_TIMEFRAMES = sorted(
+    {config[key]
+     for config in STRATEGY_CONFIGS.values()
+     if config.get('enabled', True)
+     for key in ('timeframe', 'ai_validation_tf')}
+    | {tf for tf in AI_TIMEFRAME_ANALYSIS.values() if isinstance(tf, str)}
+)
+
 def get_enabled_strategies():
     """Get list of enabled strategies"""
-    return [
-        strategy for strategy, config in STRATEGY_CONFIGS.items()
-        if config.get('enabled', True)
-    ]
+    return _ENABLED_STRATEGIES
 
 def get_strategy_config(strategy_name):
     """Get configuration for a specific strategy"""
@@ -160,20 +178,7 @@ def get_strategy_config(strategy_name):
 
 def get_all_unique_timeframes():
     """Get all unique timeframes used across strategies"""
-    timeframes = set()
-
-    # Strategy timeframes
-    for config in STRATEGY_CONFIGS.values():
-        if config.get('enabled', True):
-            timeframes.add(config['timeframe'])
-            timeframes.add(config['ai_validation_tf'])
-
-    # AI analysis timeframes
-    for tf in AI_TIMEFRAME_ANALYSIS.values():
-        if isinstance(tf, str):
-            timeframes.add(tf)
-
-    return sorted(list(timeframes))
+    return _UNIQUE_TIMEFRAMES
 
 def should_check_strategy(strategy_name, last_check_times, current_time):
     """Determine if a strategy should be checked based on its interval"""
@@ -11,6 +11,7 @@ from datetime import datetime
 from loguru import logger
 import ccxt
 import asyncio
+import http_client
 import pandas as pd
 
 # AI Ensemble - Master Trader Intelligence
@@ -381,6 +382,9 @@ class TradingEngine:
         if self.trading_thread:
             self.trading_thread.join(timeout=5)
 
+        # Close the alerter's HTTP session cleanly
+        alerter.shutdown()
+
         logger.info("🛑 Trading engine STOPPED")
         return True
 
@@ -573,17 +577,22 @@ class TradingEngine:
                 logger.debug("Creating asyncio event loop for AI analysis...")
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
-                ai_result = loop.run_until_complete(
-                    self.ai_ensemble.generate_signal(
-                        symbol=symbol,
-                        current_price=current_price,
-                        candles=candles,
-                        technical_indicators=technical_indicators,
-                        portfolio_context=portfolio_context,
-                        volatility_metrics=volatility_metrics
+                try:
+                    ai_result = loop.run_until_complete(
+                        self.ai_ensemble.generate_signal(
+                            symbol=symbol,
+                            current_price=current_price,
+                            candles=candles,
+                            technical_indicators=technical_indicators,
+                            portfolio_context=portfolio_context,
+                            volatility_metrics=volatility_metrics
+                        )
                     )
-                )
-                loop.close()
+                finally:
+                    # Release this loop's pooled HTTP session before the
+                    # loop (and its transports) goes away
+                    loop.run_until_complete(http_client.close_session())
+                    loop.close()
 
                 ai_signal = ai_result['signal']
                 ai_confidence = ai_result['confidence']
@@ -734,15 +743,20 @@ class TradingEngine:
                 logger.debug("Creating asyncio event loop for AI SELL analysis...")
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
-                ai_result = loop.run_until_complete(
-                    self.ai_ensemble.generate_signal(
-                        symbol=symbol,
-                        current_price=current_price,
-                        candles=candles,
-                        technical_indicators=technical_indicators
+                try:
+                    ai_result = loop.run_until_complete(
+                        self.ai_ensemble.generate_signal(
+                            symbol=symbol,
+                            current_price=current_price,
+                            candles=candles,
+                            technical_indicators=technical_indicators
+                        )
                     )
-                )
-                loop.close()
+                finally:
+                    # Release this loop's pooled HTTP session before the
+                    # loop (and its transports) goes away
+                    loop.run_until_complete(http_client.close_session())
+                    loop.close()
 
                 ai_signal = ai_result['signal']
                 ai_confidence = ai_result['confidence']
@@ -4,12 +4,47 @@ Dynamically adjusts model weights based on performance
 """
 import json
 import os
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
 from loguru import logger
 from datetime import datetime
 
+# orjson serializes the weights payload several times faster than stdlib
+# json; fall back to stdlib if it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_line(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    def _json_line(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 class EnsembleWeightOptimizer:
     """Optimize AI ensemble weights based on predictive accuracy."""
 
+    # Model was correct if:
+    # 1. It predicted BUY and the trade was a WIN
+    # 2. It predicted HOLD/SELL and the trade was a LOSS (correctly avoided)
+    # All other (prediction, outcome) pairs score 0 via .get
+    _CORRECT = {
+        ('BUY', 'WIN'): 1,
+        ('HOLD', 'LOSS'): 1,
+        ('SELL', 'LOSS'): 1
+    }
+
     def __init__(self, initial_weights: dict = None):
         """
         Initialize with starting weights.
@@ -27,52 +62,150 @@ class EnsembleWeightOptimizer:
 
         self.weights = initial_weights
         self.weights_file = 'ensemble_weights.json'
+        self.history_file = 'ensemble_weights_history.jsonl'
 
         # Load saved weights if they exist
         self._load_weights()
 
-        # Performance tracking
-        self.performance_tracker = {
-            'sentiment': {'correct': 0, 'total': 0},
-            'technical': {'correct': 0, 'total': 0},
-            'macro': {'correct': 0, 'total': 0},
-            'deepseek': {'correct': 0, 'total': 0}
-        }
-
-        # Optimization history
-        self.optimization_history = []
+        # Fixed model order + float64 mirror of the weights: the
+        # optimization arithmetic runs as array ops over these instead of
+        # chained dict comprehensions
+        self._model_order = tuple(self.weights)
+        self._weights_arr = np.fromiter(
+            self.weights.values(), np.float64, count=len(self.weights)
+        )
+        # Last-persisted snapshot + timestamp: saves are skipped when
+        # neither the weights nor the tracker counters have moved, and
+        # coalesced when calls come back-to-back (NaN sentinel guarantees
+        # the first save runs)
+        self._last_saved_arr = np.full_like(self._weights_arr, np.nan)
+        self._last_saved_tracker = None
+        self._last_save_ts = float('-inf')
+        # Weights only change on optimization, so the log string is
+        # formatted once per change rather than per log call
+        self._weights_str = self._build_weights_str()
+
+        # Performance tracking: per-model hit counters as int64 arrays
+        # indexed by _model_order position, so the per-trade recording
+        # path is a couple of vector ops instead of dict-of-dict mutation
+        self._idx = {model: i for i, model in enumerate(self._model_order)}
+        self._correct = np.zeros(len(self._model_order), dtype=np.int64)
+        self._total = np.zeros(len(self._model_order), dtype=np.int64)
+        # Trades recorded since the last optimization: should_optimize
+        # becomes a single compare instead of re-deriving it from the
+        # counters with a modulo every call
+        self._trades_since_opt = 0
+
+        # Restore counters persisted by _save_weights, so a restart
+        # mid-interval resumes the partial cycle instead of discarding it
+        for model, stats in self._saved_tracker.items():
+            i = self._idx.get(model)
+            if i is not None:
+                self._correct[i] = stats.get('correct', 0)
+                self._total[i] = stats.get('total', 0)
+        self._trades_since_opt = int(self._saved_trades_since_opt)
+
+        # Optimization history: ring buffer in memory (the full log lives
+        # in the JSONL file), so a long-running bot can't grow unbounded
+        self.optimization_history = deque(maxlen=200)
 
         logger.success(f"✓ Ensemble Weight Optimizer initialized")
         logger.info(f"Current weights: {self._format_weights()}")
 
     def _load_weights(self):
-        """Load saved weights from file."""
+        """Load saved weights (and tracker counters) from file."""
+        self._saved_tracker = {}
+        self._saved_trades_since_opt = 0
         if os.path.exists(self.weights_file):
             try:
-                with open(self.weights_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.weights_file, 'rb') as f:
+                    data = _json_loads(f.read())
                     self.weights = data.get('weights', self.weights)
+                    # Counters are stashed here and applied once the
+                    # arrays exist (see __init__ ordering)
+                    self._saved_tracker = data.get('tracker', {})
+                    self._saved_trades_since_opt = data.get('trades_since_opt', 0)
                     logger.info(f"Loaded saved ensemble weights from {self.weights_file}")
             except Exception as e:
                 logger.warning(f"Could not load saved weights: {e}")
 
-    def _save_weights(self):
-        """Save current weights to file."""
+    _SAVE_EPSILON = 1e-4       # Max per-weight change considered "unchanged"
+    _SAVE_MIN_INTERVAL = 5.0   # Seconds between writes when cycles pile up
+
+    def _tracker_state(self):
+        """Snapshot of the counters for change detection."""
+        return (self._correct.tobytes(), self._total.tobytes(), self._trades_since_opt)
+
+    def _save_weights(self, force=False):
+        """
+        Save current weights and counters to file.
+
+        Skipped when nothing has effectively changed, and coalesced when
+        calls land back-to-back; force=True bypasses both guards (used
+        after an optimization, where dropping the save would leave the
+        consumed cycle's counters on disk to be re-applied on restart).
+        The weight-delta epsilon only suppresses the weight comparison —
+        tracker-counter changes always count as a change, so a save
+        deferred by the interval guard is retried on the next trade.
+        """
+        now = time.monotonic()
+        if not force:
+            delta = np.max(np.abs(self._weights_arr - self._last_saved_arr))
+            if delta < self._SAVE_EPSILON and self._tracker_state() == self._last_saved_tracker:
+                logger.debug("Weights and counters unchanged, skipping save")
+                return
+            if now - self._last_save_ts < self._SAVE_MIN_INTERVAL:
+                logger.debug("Weights saved {:.1f}s ago, coalescing", now - self._last_save_ts)
+                return
         try:
-            with open(self.weights_file, 'w') as f:
-                json.dump({
-                    'weights': self.weights,
-                    'last_updated': datetime.now().isoformat(),
-                    'optimization_count': len(self.optimization_history)
-                }, f, indent=2)
+            payload = _json_dumps({
+                'weights': self.weights,
+                'tracker': {
+                    model: {'correct': int(self._correct[i]), 'total': int(self._total[i])}
+                    for model, i in self._idx.items()
+                },
+                'trades_since_opt': self._trades_since_opt,
+                'last_updated': datetime.now().isoformat(),
+                'optimization_count': len(self.optimization_history)
+            })
+            # tempfile + os.replace: a crash mid-write can never leave a
+            # truncated weights file for the next startup to choke on
+            fd, tmp = tempfile.mkstemp(
+                dir=os.path.dirname(self.weights_file) or '.', suffix='.json'
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp, self.weights_file)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            self._last_saved_arr = self._weights_arr.copy()
+            self._last_saved_tracker = self._tracker_state()
+            self._last_save_ts = now
             logger.debug(f"Weights saved to {self.weights_file}")
         except Exception as e:
             logger.error(f"Failed to save weights: {e}")
 
-    def _format_weights(self):
-        """Format weights for logging."""
+    def _append_history(self, record):
+        """Append one optimization record to the JSONL history log."""
+        try:
+            # Append-only line write: no rewriting the whole history per
+            # cycle, and the on-disk log keeps what the ring buffer drops
+            with open(self.history_file, 'ab') as f:
+                f.write(_json_line(record) + b'\n')
+        except Exception as e:
+            logger.error(f"Failed to append optimization history: {e}")
+
+    def _build_weights_str(self):
+        """Format the current weights into the log string."""
         return ", ".join([f"{model}: {weight:.2%}" for model, weight in self.weights.items()])
 
+    def _format_weights(self):
+        """Format weights for logging (cached; rebuilt on weight change)."""
+        return self._weights_str
+
     def record_prediction(self, model_predictions: dict, actual_outcome: str):
         """
         Record each model's prediction and the actual outcome.
@@ -81,20 +214,25 @@ class EnsembleWeightOptimizer:
             model_predictions: dict like {'sentiment': 'BUY', 'technical': 'BUY', 'macro': 'HOLD', 'deepseek': 'BUY'}
             actual_outcome: 'WIN' or 'LOSS'
         """
-        for model, prediction in model_predictions.items():
-            if model not in self.performance_tracker:
-                continue
-
-            self.performance_tracker[model]['total'] += 1
-
-            # Model was correct if:
-            # 1. It predicted BUY and the trade was a WIN
-            # 2. It predicted HOLD/SELL and the trade was a LOSS (correctly avoided)
-            was_correct = (prediction == 'BUY' and actual_outcome == 'WIN') or \
-                         (prediction in ['HOLD', 'SELL'] and actual_outcome == 'LOSS')
-
-            if was_correct:
-                self.performance_tracker[model]['correct'] += 1
+        # One _CORRECT table probe per model replaces the old boolean
+        # tree (two equality checks, an `in` scan, and/or chains)
+        hit = self._CORRECT.get
+        preds = [
+            (self._idx[model], hit((prediction, actual_outcome), 0))
+            for model, prediction in model_predictions.items()
+            if model in self._idx
+        ]
+        if preds:
+            n = len(preds)
+            idx = np.fromiter((i for i, _ in preds), np.intp, count=n)
+            hits = np.fromiter((h for _, h in preds), np.int64, count=n)
+
+            self._total[idx] += 1
+            self._correct[idx] += hits
+            self._trades_since_opt += 1
+            # Persist the partial cycle (throttled by _SAVE_MIN_INTERVAL)
+            # so a crash mid-interval doesn't discard the counts
+            self._save_weights()
 
         logger.debug(f"Recorded predictions: {model_predictions} -> {actual_outcome}")
 
@@ -109,7 +247,7 @@ class EnsembleWeightOptimizer:
             dict: New optimized weights
         """
         # Check if we have enough data
-        total_trades = self.performance_tracker['deepseek']['total']
+        total_trades = int(self._total[self._idx['deepseek']])
 
         if total_trades < min_trades:
             logger.info(f"Not enough trades for optimization ({total_trades}/{min_trades})")
@@ -117,42 +255,33 @@ class EnsembleWeightOptimizer:
 
         logger.info(f"🔧 OPTIMIZING ENSEMBLE WEIGHTS (based on {total_trades} trades)...")
 
-        # Calculate accuracy for each model
-        accuracies = {}
-        for model, stats in self.performance_tracker.items():
-            if stats['total'] > 0:
-                accuracy = stats['correct'] / stats['total']
-                accuracies[model] = accuracy
-                logger.info(f"   {model}: {accuracy:.2%} accurate ({stats['correct']}/{stats['total']})")
-            else:
-                accuracies[model] = 0.5  # Default to 50% if no data
+        # Accuracy -> proportional weights -> smoothing -> renormalize as
+        # one vectorized pipeline over fixed-order arrays instead of four
+        # chained dict comprehensions
+        correct = self._correct.astype(np.float64)
+        total = self._total.astype(np.float64)
+        # Default to 50% accuracy for models with no data
+        acc = np.where(total > 0, correct / np.maximum(total, 1.0), 0.5)
 
-        # Calculate new weights proportional to accuracy
-        total_accuracy = sum(accuracies.values())
+        accuracies = dict(zip(self._model_order, acc.tolist()))
+        for model, i in self._idx.items():
+            if self._total[i] > 0:
+                logger.info(f"   {model}: {accuracies[model]:.2%} accurate ({self._correct[i]}/{self._total[i]})")
+
+        total_accuracy = acc.sum()
 
         if total_accuracy == 0:
             logger.warning("Total accuracy is zero, keeping current weights")
             return self.weights
 
-        new_weights = {
-            model: accuracy / total_accuracy
-            for model, accuracy in accuracies.items()
-        }
-
         # Apply smoothing factor (don't change weights too drastically)
         smoothing_factor = 0.3  # 30% new, 70% old
-        smoothed_weights = {
-            model: (smoothing_factor * new_weights[model]) + \
-                   ((1 - smoothing_factor) * self.weights[model])
-            for model in self.weights
-        }
+        smoothed = (smoothing_factor * (acc / total_accuracy)
+                    + (1 - smoothing_factor) * self._weights_arr)
 
         # Normalize to sum to 1.0
-        total_weight = sum(smoothed_weights.values())
-        optimized_weights = {
-            model: weight / total_weight
-            for model, weight in smoothed_weights.items()
-        }
+        optimized_arr = smoothed / smoothed.sum()
+        optimized_weights = dict(zip(self._model_order, optimized_arr.tolist()))
 
         # Log changes
         logger.info("📊 WEIGHT CHANGES:")
@@ -163,22 +292,32 @@ class EnsembleWeightOptimizer:
             arrow = "📈" if change > 0 else "📉" if change < 0 else "➡️"
             logger.info(f"   {arrow} {model}: {old:.2%} → {new:.2%} ({change:+.1f}%)")
 
-        # Store optimization history
-        self.optimization_history.append({
+        # Store optimization history (in-memory ring + persistent JSONL).
+        # No defensive copies: self.weights is reassigned (never mutated
+        # in place) below, and optimized_weights/accuracies are fresh
+        # dicts nothing else holds, so the references are already stable.
+        record = {
             'timestamp': datetime.now().isoformat(),
             'trades_analyzed': total_trades,
-            'old_weights': self.weights.copy(),
-            'new_weights': optimized_weights.copy(),
-            'accuracies': accuracies.copy()
-        })
+            'old_weights': self.weights,
+            'new_weights': optimized_weights,
+            'accuracies': accuracies
+        }
+        self.optimization_history.append(record)
+        self._append_history(record)
 
-        # Update weights
+        # Update weights (dict for consumers, array mirror for the math)
         self.weights = optimized_weights
-        self._save_weights()
+        self._weights_arr = optimized_arr
+        self._weights_str = self._build_weights_str()
 
-        # Reset performance tracker for next optimization cycle
-        for model in self.performance_tracker:
-            self.performance_tracker[model] = {'correct': 0, 'total': 0}
+        # Reset performance counters BEFORE saving: the persisted state
+        # must describe the fresh cycle, or a restart would restore the
+        # consumed counters and fold this cycle into the weights again
+        self._correct[:] = 0
+        self._total[:] = 0
+        self._trades_since_opt = 0
+        self._save_weights(force=True)
 
         logger.success(f"✅ Ensemble weights optimized!")
         logger.info(f"New weights: {self._format_weights()}")
@@ -192,19 +331,14 @@ class EnsembleWeightOptimizer:
     def get_performance_summary(self):
         """Get current performance stats."""
         summary = {}
-        for model, stats in self.performance_tracker.items():
-            if stats['total'] > 0:
-                summary[model] = {
-                    'accuracy': stats['correct'] / stats['total'],
-                    'correct': stats['correct'],
-                    'total': stats['total']
-                }
-            else:
-                summary[model] = {
-                    'accuracy': 0.0,
-                    'correct': 0,
-                    'total': 0
-                }
+        for model, i in self._idx.items():
+            correct = int(self._correct[i])
+            total = int(self._total[i])
+            summary[model] = {
+                'accuracy': correct / total if total > 0 else 0.0,
+                'correct': correct,
+                'total': total
+            }
         return summary
 
     def should_optimize(self, optimization_interval: int = 100):
@@ -217,5 +351,4 @@ class EnsembleWeightOptimizer:
         Returns:
             bool: True if optimization should run
         """
-        total_trades = self.performance_tracker['deepseek']['total']
-        return total_trades >= optimization_interval and total_trades % optimization_interval == 0
+        return self._trades_since_opt >= optimization_interval